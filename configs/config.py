@@ -6,12 +6,68 @@ Handles loading and accessing environment variables and configuration settings.
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from sqlalchemy.pool import StaticPool
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
 
+def load_jwt_key(path: str, private: bool):
+    """
+    Load a PEM-encoded JWT signing or verification key once.
+
+    The parsed key object is handed to flask-jwt-extended so it is not
+    re-parsed for every token.
+
+    Args:
+        path: Path to the PEM file (empty or None to skip)
+        private: Load a private (signing) key instead of a public key
+
+    Returns:
+        Parsed key object, or None when no path is configured
+    """
+    if not path:
+        return None
+
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+
+    with open(path, 'rb') as key_file:
+        pem = key_file.read()
+
+    if private:
+        return load_pem_private_key(pem, password=None)
+    return load_pem_public_key(pem)
+
+
+def database_engine_options(database_uri: str) -> dict:
+    """
+    Build SQLAlchemy engine options for a database URI.
+
+    Connection pool sizing only applies to PostgreSQL; SQLite keeps
+    SQLAlchemy's default pool for its driver.
+
+    Args:
+        database_uri: SQLAlchemy database URI
+
+    Returns:
+        Engine options dictionary
+    """
+    options = {
+        'pool_pre_ping': True,
+        'query_cache_size': int(os.getenv('DB_QUERY_CACHE_SIZE', 2000))
+    }
+
+    if database_uri.startswith('postgresql'):
+        options.update(
+            pool_size=int(os.getenv('DB_POOL_SIZE', 20)),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 40)),
+            pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800))
+        )
+
+    return options
+
+
 class Config:
     """Base configuration class with common settings."""
 
@@ -19,6 +75,7 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///smartmeetingroom.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = os.getenv('FLASK_DEBUG', 'False') == 'True'
+    SQLALCHEMY_ENGINE_OPTIONS = database_engine_options(SQLALCHEMY_DATABASE_URI)
 
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
@@ -27,6 +84,11 @@ class Config:
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
+    # HS256 signs with JWT_SECRET_KEY; asymmetric algorithms (e.g. EdDSA) use the PEM keys below.
+    # Only the users service needs the private key; other services verify with the public key.
+    JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
+    JWT_PRIVATE_KEY = load_jwt_key(os.getenv('JWT_PRIVATE_KEY_PATH'), private=True)
+    JWT_PUBLIC_KEY = load_jwt_key(os.getenv('JWT_PUBLIC_KEY_PATH'), private=False)
 
     # Flask
     DEBUG = os.getenv('FLASK_DEBUG', 'False') == 'True'
@@ -49,7 +111,10 @@ class Config:
     REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
     REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
     REDIS_DB = int(os.getenv('REDIS_DB', 0))
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 64))
     CACHE_TTL = int(os.getenv('CACHE_TTL', 300))
+    CACHE_L1_SIZE = int(os.getenv('CACHE_L1_SIZE', 2048))
+    CACHE_L1_TTL = int(os.getenv('CACHE_L1_TTL', 5))
 
     # RabbitMQ
     RABBITMQ_HOST = os.getenv('RABBITMQ_HOST', 'localhost')
@@ -60,6 +125,16 @@ class Config:
 
     # Security
     BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Every gunicorn worker forks its own hashing pool, so split the cores between them
+    PASSWORD_HASH_POOL_WORKERS = int(os.getenv(
+        'PASSWORD_HASH_POOL_WORKERS',
+        max(1, (os.cpu_count() or 1) // int(os.getenv('GUNICORN_WORKERS', 2)))
+    ))
+    ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))
+    ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 64 * 1024))  # KiB
+    ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 4))
+    PASSWORD_VERIFY_CACHE_SIZE = int(os.getenv('PASSWORD_VERIFY_CACHE_SIZE', 4096))
+    PASSWORD_VERIFY_CACHE_TTL = int(os.getenv('PASSWORD_VERIFY_CACHE_TTL', 300))
     MAX_LOGIN_ATTEMPTS = int(os.getenv('MAX_LOGIN_ATTEMPTS', 5))
     ACCOUNT_LOCK_DURATION = int(os.getenv('ACCOUNT_LOCK_DURATION', 1800))
 
@@ -67,9 +142,17 @@ class Config:
     RATE_LIMIT_PER_MINUTE = int(os.getenv('RATE_LIMIT_PER_MINUTE', 60))
     RATE_LIMIT_PER_HOUR = int(os.getenv('RATE_LIMIT_PER_HOUR', 1000))
 
+    # Audit logging (rows are batched by a background writer unless disabled)
+    AUDIT_ENABLED = os.getenv('AUDIT_ENABLED', 'True') == 'True'
+    AUDIT_LOG_ASYNC = os.getenv('AUDIT_LOG_ASYNC', 'True') == 'True'
+    AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE', 10_000))
+    AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', 100))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', 1.0))
+
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('LOG_FILE', 'app.log')
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
 
     # CORS
     CORS_ORIGINS = ['http://localhost:3000', 'http://localhost:8080']
@@ -84,8 +167,18 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     """Testing environment configuration."""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite:///test_smartmeetingroom.db')
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite:///:memory:')
     JWT_SECRET_KEY = 'test-secret-key'
+    AUDIT_LOG_ASYNC = False
+
+    # One shared connection so every fixture sees the same in-memory database
+    if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'connect_args': {'check_same_thread': False},
+            'poolclass': StaticPool
+        }
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = database_engine_options(SQLALCHEMY_DATABASE_URI)
 
 
 class ProductionConfig(Config):
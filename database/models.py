@@ -10,6 +10,11 @@ from sqlalchemy.dialects.postgresql import ARRAY, JSONB, INET
 
 db = SQLAlchemy()
 
+# PostgreSQL-specific column types with portable fallbacks for SQLite (dev/test)
+StringArray = ARRAY(db.String).with_variant(db.JSON, 'sqlite')
+JSONDocument = JSONB().with_variant(db.JSON, 'sqlite')
+IPAddress = INET().with_variant(db.String(45), 'sqlite')
+
 
 class BaseModel(db.Model):
     """Base model class with common fields and methods."""
@@ -85,7 +90,8 @@ class User(BaseModel):
         ),
         Index('idx_users_username', 'username'),
         Index('idx_users_email', 'email'),
-        Index('idx_users_role', 'role'),
+        # Covers role/is_active filters and the created_at ordering of the admin user list
+        Index('idx_users_role_active_created', 'role', 'is_active', 'created_at'),
     )
 
     def is_locked(self):
@@ -123,8 +129,8 @@ class Room(BaseModel):
     floor = db.Column(db.Integer)
     building = db.Column(db.String(50))
     location = db.Column(db.String(200))
-    equipment = db.Column(ARRAY(db.String), default=list)
-    amenities = db.Column(ARRAY(db.String), default=list)
+    equipment = db.Column(StringArray, default=list)
+    amenities = db.Column(StringArray, default=list)
     status = db.Column(
         db.String(20),
         default='available',
@@ -212,7 +218,8 @@ class Booking(BaseModel):
             "recurrence_pattern IS NULL OR recurrence_pattern IN ('daily', 'weekly', 'monthly')",
             name='check_recurrence_pattern'
         ),
-        Index('idx_bookings_user_id', 'user_id'),
+        # Covers a user's booking history ordered by created_at
+        Index('idx_bookings_user_created', 'user_id', 'created_at'),
         Index('idx_bookings_room_id', 'room_id'),
         Index('idx_bookings_start_time', 'start_time'),
         Index('idx_bookings_end_time', 'end_time'),
@@ -335,9 +342,9 @@ class AuditLog(BaseModel):
     action = db.Column(db.String(50), nullable=False)
     resource_type = db.Column(db.String(50))
     resource_id = db.Column(db.Integer)
-    old_values = db.Column(JSONB)
-    new_values = db.Column(JSONB)
-    ip_address = db.Column(INET)
+    old_values = db.Column(JSONDocument)
+    new_values = db.Column(JSONDocument)
+    ip_address = db.Column(IPAddress)
     user_agent = db.Column(db.Text)
     success = db.Column(db.Boolean, default=True, nullable=False)
     error_message = db.Column(db.Text)
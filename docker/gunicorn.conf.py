@@ -0,0 +1,20 @@
+"""
+Gunicorn settings shared by the service containers.
+
+Threaded workers let one process keep serving I/O-bound requests while other
+threads wait on the database or on the password hashing process pool.
+"""
+
+import os
+
+worker_class = 'gthread'
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+
+def post_fork(server, worker):
+    """Fork the users service's password hashing pool before request threads start."""
+    if server.app.app_uri.startswith('services.users'):
+        from utils.auth import warm_hash_pool
+        warm_hash_pool()
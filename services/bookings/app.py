@@ -19,7 +19,7 @@ from datetime import datetime, timedelta
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, g, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required
 from prometheus_flask_exporter import PrometheusMetrics
@@ -38,12 +38,13 @@ from utils.validators import (
 )
 from utils.sanitizers import sanitize_string
 from utils.responses import *
-from utils.decorators import handle_errors, audit_log, rate_limit, validate_json
+from utils.decorators import handle_errors, guard
 from utils.logger import setup_logger
 from utils.cache import cache, cached, invalidate_cache
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 config = get_config()
 app.config.from_object(config)
 
@@ -56,8 +57,10 @@ metrics = PrometheusMetrics(app)
 # Setup logger
 logger = setup_logger('bookings-service')
 
-# Database initialization
-with app.app_context():
+# Database initialization (run once per deployment: flask --app services.bookings.app init-db)
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables."""
     db.create_all()
     logger.info("Bookings Service database initialized")
 
@@ -75,8 +78,7 @@ def health_check():
 
 @app.route('/api/bookings', methods=['GET'])
 @jwt_required()
-@handle_errors
-@rate_limit(limit=100, window=60)
+@guard(limit=100, window=60)
 def get_all_bookings():
     """
     Get all bookings (filtered by user role).
@@ -200,10 +202,7 @@ def get_booking(booking_id):
 
 @app.route('/api/bookings', methods=['POST'])
 @jwt_required()
-@handle_errors
-@validate_json
-@audit_log('create_booking', 'booking')
-@rate_limit(limit=50, window=3600)
+@guard(json_body=True, audit='create_booking', resource_type='booking', limit=50, window=3600)
 def create_booking():
     """
     Create a new booking.
@@ -237,7 +236,7 @@ def create_booking():
         }
     """
     current_user = get_current_user()
-    data = request.get_json()
+    data = g.json
 
     # Validate required fields
     validate_required_fields(data, ['room_id', 'title', 'start_time', 'end_time'])
@@ -335,9 +334,7 @@ def create_booking():
 
 @app.route('/api/bookings/<int:booking_id>', methods=['PUT'])
 @jwt_required()
-@handle_errors
-@validate_json
-@audit_log('update_booking', 'booking')
+@guard(json_body=True, audit='update_booking', resource_type='booking')
 def update_booking(booking_id):
     """
     Update a booking.
@@ -372,7 +369,7 @@ def update_booking(booking_id):
     if booking.status == 'cancelled':
         return conflict_response("Cannot update cancelled booking")
 
-    data = request.get_json()
+    data = g.json
 
     # Update title
     if 'title' in data:
@@ -445,8 +442,7 @@ def update_booking(booking_id):
 
 @app.route('/api/bookings/<int:booking_id>', methods=['DELETE'])
 @jwt_required()
-@handle_errors
-@audit_log('cancel_booking', 'booking')
+@guard(audit='cancel_booking', resource_type='booking')
 def cancel_booking(booking_id):
     """
     Cancel a booking.
@@ -496,9 +492,7 @@ def cancel_booking(booking_id):
 
 
 @app.route('/api/bookings/check-availability', methods=['POST'])
-@handle_errors
-@validate_json
-@rate_limit(limit=100, window=60)
+@guard(json_body=True, limit=100, window=60)
 def check_availability():
     """
     Check room availability for a time slot.
@@ -519,7 +513,7 @@ def check_availability():
             "end_time": "2025-11-25T11:00:00Z"
         }
     """
-    data = request.get_json()
+    data = g.json
 
     validate_required_fields(data, ['start_time', 'end_time'])
 
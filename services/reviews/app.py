@@ -18,7 +18,7 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, g, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required
 from prometheus_flask_exporter import PrometheusMetrics
@@ -35,12 +35,13 @@ from utils.validators import (
 )
 from utils.sanitizers import sanitize_comment, sanitize_string, has_xss_pattern
 from utils.responses import *
-from utils.decorators import handle_errors, audit_log, rate_limit, validate_json
+from utils.decorators import handle_errors, guard
 from utils.logger import setup_logger
 from utils.cache import cache, cached, invalidate_cache
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 config = get_config()
 app.config.from_object(config)
 
@@ -53,8 +54,10 @@ metrics = PrometheusMetrics(app)
 # Setup logger
 logger = setup_logger('reviews-service')
 
-# Database initialization
-with app.app_context():
+# Database initialization (run once per deployment: flask --app services.reviews.app init-db)
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables."""
     db.create_all()
     logger.info("Reviews Service database initialized")
 
@@ -72,10 +75,7 @@ def health_check():
 
 @app.route('/api/reviews', methods=['POST'])
 @jwt_required()
-@handle_errors
-@validate_json
-@audit_log('submit_review', 'review')
-@rate_limit(limit=10, window=3600)  # 10 reviews per hour
+@guard(json_body=True, audit='submit_review', resource_type='review', limit=10, window=3600)  # 10 reviews per hour
 def submit_review():
     """
     Submit a review for a room.
@@ -108,7 +108,7 @@ def submit_review():
         }
     """
     current_user = get_current_user()
-    data = request.get_json()
+    data = g.json
 
     # Validate required fields
     validate_required_fields(data, ['room_id', 'rating'])
@@ -235,9 +235,7 @@ def get_review(review_id):
 
 @app.route('/api/reviews/<int:review_id>', methods=['PUT'])
 @jwt_required()
-@handle_errors
-@validate_json
-@audit_log('update_review', 'review')
+@guard(json_body=True, audit='update_review', resource_type='review')
 def update_review(review_id):
     """
     Update a review (owner only).
@@ -264,7 +262,7 @@ def update_review(review_id):
     if review.user_id != current_user['user_id']:
         return forbidden_response("You can only update your own reviews")
 
-    data = request.get_json()
+    data = g.json
 
     # Update rating
     if 'rating' in data:
@@ -314,8 +312,7 @@ def update_review(review_id):
 
 @app.route('/api/reviews/<int:review_id>', methods=['DELETE'])
 @jwt_required()
-@handle_errors
-@audit_log('delete_review', 'review')
+@guard(audit='delete_review', resource_type='review')
 def delete_review(review_id):
     """
     Delete a review.
@@ -350,9 +347,8 @@ def delete_review(review_id):
 
 
 @app.route('/api/reviews/room/<int:room_id>', methods=['GET'])
-@handle_errors
-@rate_limit(limit=100, window=60)
-@cached(key_prefix='room_reviews', ttl=300)
+@guard(limit=100, window=60)
+@cached(key_prefix='room_reviews', ttl=300, key_builder=lambda room_id: room_id)
 def get_room_reviews(room_id):
     """
     Get all reviews for a specific room.
@@ -452,10 +448,7 @@ def get_room_reviews(room_id):
 
 @app.route('/api/reviews/<int:review_id>/flag', methods=['POST'])
 @jwt_required()
-@handle_errors
-@validate_json
-@audit_log('flag_review', 'review')
-@rate_limit(limit=20, window=3600)
+@guard(json_body=True, audit='flag_review', resource_type='review', limit=20, window=3600)
 def flag_review(review_id):
     """
     Flag a review as inappropriate.
@@ -474,7 +467,7 @@ def flag_review(review_id):
     if not review:
         return not_found_response("Review not found")
 
-    data = request.get_json()
+    data = g.json
     validate_required_fields(data, ['reason'])
 
     reason = sanitize_string(data['reason'], max_length=200)
@@ -545,9 +538,7 @@ def get_flagged_reviews():
 @app.route('/api/reviews/<int:review_id>/moderate', methods=['PUT'])
 @jwt_required()
 @moderator_required
-@handle_errors
-@validate_json
-@audit_log('moderate_review', 'review')
+@guard(json_body=True, audit='moderate_review', resource_type='review')
 def moderate_review(review_id):
     """
     Moderate a review (Moderator/Admin only).
@@ -566,7 +557,7 @@ def moderate_review(review_id):
     if not review:
         return not_found_response("Review not found")
 
-    data = request.get_json()
+    data = g.json
     validate_required_fields(data, ['action'])
 
     action = data['action']
@@ -610,8 +601,7 @@ def moderate_review(review_id):
 
 @app.route('/api/reviews/<int:review_id>/helpful', methods=['POST'])
 @jwt_required()
-@handle_errors
-@rate_limit(limit=50, window=3600)
+@guard(limit=50, window=3600)
 def mark_helpful(review_id):
     """
     Mark a review as helpful.
@@ -635,8 +625,7 @@ def mark_helpful(review_id):
 
 @app.route('/api/reviews/<int:review_id>/unhelpful', methods=['POST'])
 @jwt_required()
-@handle_errors
-@rate_limit(limit=50, window=3600)
+@guard(limit=50, window=3600)
 def mark_unhelpful(review_id):
     """
     Mark a review as unhelpful.
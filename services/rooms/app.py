@@ -13,15 +13,19 @@ Team Member: Hassan Fouani
 
 import sys
 import os
+import re
+from datetime import datetime
+from functools import lru_cache
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, Response, request, g, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required
 from prometheus_flask_exporter import PrometheusMetrics
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, exists, select, func, bindparam
 
 from configs.config import get_config
 from database.models import db, Room, Booking, init_db
@@ -34,12 +38,13 @@ from utils.validators import (
 )
 from utils.sanitizers import sanitize_string, sanitize_url
 from utils.responses import *
-from utils.decorators import handle_errors, audit_log, rate_limit, validate_json
+from utils.decorators import guard
 from utils.logger import setup_logger
 from utils.cache import cache, cached, invalidate_cache
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 config = get_config()
 app.config.from_object(config)
 
@@ -52,11 +57,157 @@ metrics = PrometheusMetrics(app)
 # Setup logger
 logger = setup_logger('rooms-service')
 
-# Database initialization
-with app.app_context():
+# Database initialization (run once per deployment: flask --app services.rooms.app init-db)
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables."""
     db.create_all()
     logger.info("Rooms Service database initialized")
 
+# Cheap shape check so common malformed timestamps are rejected without raising
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Separator for the comma-separated equipment query parameter
+_EQ_SPLIT = re.compile(r'\s*,\s*')
+
+# Upper bound on equipment items per request, to bound the work done per filter
+MAX_EQUIPMENT_FILTERS = 20
+
+# datetime.fromisoformat accepts a trailing 'Z' natively from Python 3.11
+_NEEDS_Z_REPLACE = sys.version_info < (3, 11)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value):
+    """Parse an ISO 8601 timestamp, memoized across repeated identical requests."""
+    if _NEEDS_Z_REPLACE:
+        value = value.replace('Z', '+00:00')
+    return datetime.fromisoformat(value)
+
+
+# get_all_rooms filters in bitmask order, each a WHERE clause over a bind parameter
+_ROOM_LIST_FILTERS = (
+    ('capacity_min', lambda: Room.capacity >= bindparam('capacity_min')),
+    ('capacity_max', lambda: Room.capacity <= bindparam('capacity_max')),
+    ('location', lambda: Room.location.ilike(bindparam('location'))),
+    ('building', lambda: Room.building.ilike(bindparam('building'))),
+    ('floor', lambda: Room.floor == bindparam('floor')),
+    ('status', lambda: Room.status == bindparam('status')),
+    ('equipment', lambda: Room.equipment.contains(bindparam('equipment'))),
+)
+
+# Statements built once per combination of supplied filters, keyed by bitmask
+_room_list_statements = {}
+
+
+def _room_list_statements_for(params):
+    """
+    Get the room listing statements for the set of filters present in params.
+
+    Args:
+        params: Bind parameter values keyed by filter name
+
+    Returns:
+        Tuple of (ordered select, paged select, count select)
+    """
+    mask = 0
+    for bit, (name, _) in enumerate(_ROOM_LIST_FILTERS):
+        if name in params:
+            mask |= 1 << bit
+
+    statements = _room_list_statements.get(mask)
+    if statements is None:
+        clauses = [build() for bit, (_, build) in enumerate(_ROOM_LIST_FILTERS) if mask & (1 << bit)]
+        base = select(Room).where(*clauses)
+        ordered = base.order_by(Room.name)
+        statements = (
+            ordered,
+            ordered.limit(bindparam('limit')).offset(bindparam('offset')),
+            select(func.count()).select_from(base.subquery())
+        )
+        _room_list_statements[mask] = statements
+
+    return statements
+
+
+def _parse_equipment_param(equipment):
+    """Split a comma-separated equipment parameter into unique, non-empty items in order."""
+    if not equipment:
+        return []
+    return [item for item in dict.fromkeys(_EQ_SPLIT.split(equipment.strip())) if item]
+
+
+def _array_contains_supported():
+    """Return True when the database can evaluate ARRAY containment in SQL."""
+    return db.engine.dialect.name == 'postgresql'
+
+
+def _filter_rooms_by_features(rooms, column, required):
+    """
+    Keep only rooms whose equipment/amenities contain every required item.
+
+    Mirrors the SQL contains-all filter for backends without ARRAY support
+    (SQLite in dev/test).
+
+    Args:
+        rooms: List of Room instances
+        column: 'equipment' or 'amenities'
+        required: Items that must all be present
+
+    Returns:
+        Filtered list of rooms, order preserved
+    """
+    required = frozenset(required)
+    if not required:
+        return rooms
+
+    return [room for room in rooms if required <= frozenset(getattr(room, column) or ())]
+
+
+def _room_summary(room, include_status=True):
+    """Build the room dictionary returned by the availability and search endpoints."""
+    summary = {
+        'id': room.id,
+        'name': room.name,
+        'capacity': room.capacity,
+        'floor': room.floor,
+        'building': room.building,
+        'location': room.location,
+        'equipment': room.equipment,
+        'amenities': room.amenities,
+        'hourly_rate': float(room.hourly_rate) if room.hourly_rate else None,
+        'image_url': room.image_url
+    }
+    if include_status:
+        summary['status'] = room.status
+    return summary
+
+
+def _ndjson_response(rooms, include_status=True):
+    """
+    Stream rooms as newline-delimited JSON, serializing one row at a time.
+
+    The 200 status is sent before the first row, so an error while streaming
+    cannot change it; instead the stream ends with a final
+    {"success": false, "error": ...} record that clients must check for.
+
+    Args:
+        rooms: Iterable of Room instances (a list or a yield_per query)
+        include_status: Whether each row includes the room status
+
+    Returns:
+        Streaming Flask response with application/x-ndjson mimetype
+    """
+    def generate():
+        try:
+            for room in rooms:
+                yield orjson.dumps(_room_summary(room, include_status)) + b'\n'
+        except Exception as e:
+            logger.exception("Error while streaming rooms: %s", e)
+            yield orjson.dumps({'success': False, 'error': 'Room listing interrupted'}) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -70,8 +221,7 @@ def health_check():
 
 
 @app.route('/api/rooms', methods=['GET'])
-@handle_errors
-@rate_limit(limit=100, window=60)
+@guard(limit=100, window=60)
 @cached(key_prefix='rooms_list', ttl=300)
 def get_all_rooms():
     """
@@ -94,47 +244,56 @@ def get_all_rooms():
     Example:
         GET /api/rooms?capacity_min=10&location=Main%20Building
     """
-    page = request.args.get('page', 1, type=int)
-    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = max(min(request.args.get('per_page', 20, type=int), 100), 1)
 
-    query = Room.query
+    # Collect bind parameters for the filters that were supplied
+    params = {}
 
-    # Apply filters
     capacity_min = request.args.get('capacity_min', type=int)
     if capacity_min:
-        query = query.filter(Room.capacity >= capacity_min)
+        params['capacity_min'] = capacity_min
 
     capacity_max = request.args.get('capacity_max', type=int)
     if capacity_max:
-        query = query.filter(Room.capacity <= capacity_max)
+        params['capacity_max'] = capacity_max
 
     location = request.args.get('location')
     if location:
-        query = query.filter(Room.location.ilike(f'%{location}%'))
+        params['location'] = f'%{location}%'
 
     building = request.args.get('building')
     if building:
-        query = query.filter(Room.building.ilike(f'%{building}%'))
+        params['building'] = f'%{building}%'
 
     floor = request.args.get('floor', type=int)
     if floor is not None:
-        query = query.filter(Room.floor == floor)
+        params['floor'] = floor
 
     status = request.args.get('status')
     if status:
-        query = query.filter(Room.status == status)
+        params['status'] = status
 
-    equipment = request.args.get('equipment')
-    if equipment:
-        equipment_list = [e.strip() for e in equipment.split(',')]
-        for eq in equipment_list:
-            query = query.filter(Room.equipment.contains([eq]))
+    equipment_list = _parse_equipment_param(request.args.get('equipment'))
+    if len(equipment_list) > MAX_EQUIPMENT_FILTERS:
+        return error_response(f"Too many equipment filters. Maximum is {MAX_EQUIPMENT_FILTERS}.")
 
-    # Order by name
-    query = query.order_by(Room.name)
+    filter_in_memory = bool(equipment_list) and not _array_contains_supported()
+    if equipment_list and not filter_in_memory:
+        params['equipment'] = equipment_list
+
+    ordered_stmt, page_stmt, count_stmt = _room_list_statements_for(params)
 
     # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    if filter_in_memory:
+        all_rooms = db.session.execute(ordered_stmt, params).scalars().all()
+        matching = _filter_rooms_by_features(all_rooms, 'equipment', equipment_list)
+        total = len(matching)
+        items = matching[(page - 1) * per_page:page * per_page]
+    else:
+        page_params = dict(params, limit=per_page, offset=(page - 1) * per_page)
+        items = db.session.execute(page_stmt, page_params).scalars().all()
+        total = db.session.execute(count_stmt, params).scalar()
 
     rooms = [{
         'id': room.id,
@@ -149,15 +308,14 @@ def get_all_rooms():
         'hourly_rate': float(room.hourly_rate) if room.hourly_rate else None,
         'image_url': room.image_url,
         'created_at': room.created_at.isoformat()
-    } for room in pagination.items]
+    } for room in items]
 
-    return paginated_response(rooms, page, per_page, pagination.total)
+    return paginated_response(rooms, page, per_page, total)
 
 
 @app.route('/api/rooms/<int:room_id>', methods=['GET'])
-@handle_errors
-@rate_limit(limit=100, window=60)
-@cached(key_prefix='room_detail', ttl=300)
+@guard(limit=100, window=60)
+@cached(key_prefix='room_detail', ttl=300, key_builder=lambda room_id: room_id)
 def get_room(room_id):
     """
     Get room details by ID.
@@ -190,10 +348,7 @@ def get_room(room_id):
 @app.route('/api/rooms', methods=['POST'])
 @jwt_required()
 @facility_manager_required
-@handle_errors
-@validate_json
-@audit_log('create_room', 'room')
-@rate_limit(limit=50, window=3600)
+@guard(json_body=True, audit='create_room', resource_type='room', limit=50, window=3600)
 def create_room():
     """
     Create a new meeting room (Facility Manager or Admin only).
@@ -226,7 +381,7 @@ def create_room():
             "amenities": ["wifi", "coffee_machine", "air_conditioning"]
         }
     """
-    data = request.get_json()
+    data = g.json
 
     # Validate required fields
     validate_required_fields(data, ['name', 'capacity'])
@@ -275,9 +430,7 @@ def create_room():
 @app.route('/api/rooms/<int:room_id>', methods=['PUT'])
 @jwt_required()
 @facility_manager_required
-@handle_errors
-@validate_json
-@audit_log('update_room', 'room')
+@guard(json_body=True, audit='update_room', resource_type='room')
 def update_room(room_id):
     """
     Update room details (Facility Manager or Admin only).
@@ -304,7 +457,7 @@ def update_room(room_id):
     if not room:
         return not_found_response("Room not found")
 
-    data = request.get_json()
+    data = g.json
 
     # Update name
     if 'name' in data:
@@ -365,8 +518,7 @@ def update_room(room_id):
 @app.route('/api/rooms/<int:room_id>', methods=['DELETE'])
 @jwt_required()
 @admin_required
-@handle_errors
-@audit_log('delete_room', 'room')
+@guard(audit='delete_room', resource_type='room')
 def delete_room(room_id):
     """
     Delete a room (Admin only).
@@ -380,15 +532,15 @@ def delete_room(room_id):
     if not room:
         return not_found_response("Room not found")
 
-    # Check for active bookings
+    # Check for active bookings (EXISTS stops at the first match; count only for the error)
     active_bookings = Booking.query.filter(
         Booking.room_id == room_id,
         Booking.status.in_(['pending', 'confirmed'])
-    ).count()
+    )
 
-    if active_bookings > 0:
+    if db.session.query(active_bookings.exists()).scalar():
         return conflict_response(
-            f"Cannot delete room with {active_bookings} active booking(s). "
+            f"Cannot delete room with {active_bookings.count()} active booking(s). "
             "Please cancel or complete all bookings first."
         )
 
@@ -406,8 +558,7 @@ def delete_room(room_id):
 
 
 @app.route('/api/rooms/available', methods=['GET'])
-@handle_errors
-@rate_limit(limit=100, window=60)
+@guard(limit=100, window=60)
 def get_available_rooms():
     """
     Get available rooms with optional filtering.
@@ -419,14 +570,14 @@ def get_available_rooms():
         location: Filter by location
         equipment: Comma-separated list of required equipment
 
+        format: 'ndjson' to stream one room per line instead of a JSON envelope
+
     Returns:
         200: List of available rooms
 
     Example:
         GET /api/rooms/available?capacity_min=10&equipment=projector,whiteboard
     """
-    from datetime import datetime
-
     query = Room.query.filter_by(status='available')
 
     # Apply capacity filter
@@ -440,9 +591,12 @@ def get_available_rooms():
         query = query.filter(Room.location.ilike(f'%{location}%'))
 
     # Apply equipment filter
-    equipment = request.args.get('equipment')
-    if equipment:
-        equipment_list = [e.strip() for e in equipment.split(',')]
+    equipment_list = _parse_equipment_param(request.args.get('equipment'))
+    if len(equipment_list) > MAX_EQUIPMENT_FILTERS:
+        return error_response(f"Too many equipment filters. Maximum is {MAX_EQUIPMENT_FILTERS}.")
+
+    filter_in_memory = bool(equipment_list) and not _array_contains_supported()
+    if not filter_in_memory:
         for eq in equipment_list:
             query = query.filter(Room.equipment.contains([eq]))
 
@@ -451,50 +605,49 @@ def get_available_rooms():
     end_time_str = request.args.get('end_time')
 
     if start_time_str and end_time_str:
+        if not (_ISO_DATE_RE.match(start_time_str) and _ISO_DATE_RE.match(end_time_str)):
+            return error_response("Invalid date format. Use ISO 8601 format.")
+
         try:
-            start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-            end_time = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
+            start_time = _parse_iso(start_time_str)
+            end_time = _parse_iso(end_time_str)
 
-            # Get rooms with conflicting bookings
-            conflicting_bookings = Booking.query.filter(
+            # Exclude rooms with conflicting bookings in the same statement
+            has_conflict = exists().where(
+                Booking.room_id == Room.id,
                 Booking.status.in_(['pending', 'confirmed']),
                 or_(
                     and_(Booking.start_time <= start_time, Booking.end_time > start_time),
                     and_(Booking.start_time < end_time, Booking.end_time >= end_time),
                     and_(Booking.start_time >= start_time, Booking.end_time <= end_time)
                 )
-            ).all()
-
-            booked_room_ids = {booking.room_id for booking in conflicting_bookings}
+            )
 
-            if booked_room_ids:
-                query = query.filter(Room.id.notin_(booked_room_ids))
+            query = query.filter(~has_conflict)
 
         except ValueError:
             return error_response("Invalid date format. Use ISO 8601 format.")
 
-    rooms = query.order_by(Room.name).all()
+    query = query.order_by(Room.name)
 
-    result = [{
-        'id': room.id,
-        'name': room.name,
-        'capacity': room.capacity,
-        'floor': room.floor,
-        'building': room.building,
-        'location': room.location,
-        'equipment': room.equipment,
-        'amenities': room.amenities,
-        'hourly_rate': float(room.hourly_rate) if room.hourly_rate else None,
-        'image_url': room.image_url
-    } for room in rooms]
+    if request.args.get('format') == 'ndjson' and not filter_in_memory:
+        return _ndjson_response(query.yield_per(500), include_status=False)
+
+    rooms = query.all()
+
+    if filter_in_memory:
+        rooms = _filter_rooms_by_features(rooms, 'equipment', equipment_list)
+
+    if request.args.get('format') == 'ndjson':
+        return _ndjson_response(rooms, include_status=False)
+
+    result = [_room_summary(room, include_status=False) for room in rooms]
 
     return success_response(result, message=f"Found {len(result)} available rooms")
 
 
 @app.route('/api/rooms/search', methods=['POST'])
-@handle_errors
-@validate_json
-@rate_limit(limit=100, window=60)
+@guard(json_body=True, limit=100, window=60)
 def search_rooms():
     """
     Advanced room search.
@@ -508,6 +661,9 @@ def search_rooms():
         floor: Floor number
         building: Building name
 
+    Query Parameters:
+        format: 'ndjson' to stream one room per line instead of a JSON envelope
+
     Returns:
         200: List of matching rooms
 
@@ -520,7 +676,7 @@ def search_rooms():
             "building": "Main Building"
         }
     """
-    data = request.get_json()
+    data = g.json
 
     query = Room.query
 
@@ -543,13 +699,15 @@ def search_rooms():
     if 'capacity_max' in data:
         query = query.filter(Room.capacity <= data['capacity_max'])
 
+    filter_in_memory = bool(data.get('equipment') or data.get('amenities')) and not _array_contains_supported()
+
     # Equipment requirements
-    if 'equipment' in data and data['equipment']:
+    if 'equipment' in data and data['equipment'] and not filter_in_memory:
         for eq in data['equipment']:
             query = query.filter(Room.equipment.contains([eq]))
 
     # Amenities requirements
-    if 'amenities' in data and data['amenities']:
+    if 'amenities' in data and data['amenities'] and not filter_in_memory:
         for amenity in data['amenities']:
             query = query.filter(Room.amenities.contains([amenity]))
 
@@ -561,21 +719,21 @@ def search_rooms():
     if 'building' in data:
         query = query.filter(Room.building.ilike(f"%{data['building']}%"))
 
-    rooms = query.order_by(Room.name).all()
+    query = query.order_by(Room.name)
 
-    result = [{
-        'id': room.id,
-        'name': room.name,
-        'capacity': room.capacity,
-        'floor': room.floor,
-        'building': room.building,
-        'location': room.location,
-        'equipment': room.equipment,
-        'amenities': room.amenities,
-        'status': room.status,
-        'hourly_rate': float(room.hourly_rate) if room.hourly_rate else None,
-        'image_url': room.image_url
-    } for room in rooms]
+    if request.args.get('format') == 'ndjson' and not filter_in_memory:
+        return _ndjson_response(query.yield_per(500))
+
+    rooms = query.all()
+
+    if filter_in_memory:
+        rooms = _filter_rooms_by_features(rooms, 'equipment', data.get('equipment') or [])
+        rooms = _filter_rooms_by_features(rooms, 'amenities', data.get('amenities') or [])
+
+    if request.args.get('format') == 'ndjson':
+        return _ndjson_response(rooms)
+
+    result = [_room_summary(room) for room in rooms]
 
     return success_response(result, message=f"Found {len(result)} matching rooms")
 
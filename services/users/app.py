@@ -19,14 +19,23 @@ from datetime import datetime, timedelta
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, g, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity, get_jwt
 from prometheus_flask_exporter import PrometheusMetrics
+from sqlalchemy import or_, func, update, case
+from sqlalchemy.exc import IntegrityError
 
 from configs.config import get_config
-from database.models import db, User, Booking, init_db
-from utils.auth import hash_password, verify_password, generate_tokens, get_current_user, admin_required
+from database.models import db, User, Room, Booking, init_db
+from utils.auth import (
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    generate_tokens,
+    get_current_user,
+    admin_required
+)
 from utils.validators import (
     validate_required_fields,
     validate_email_format,
@@ -37,13 +46,14 @@ from utils.validators import (
 )
 from utils.sanitizers import sanitize_username, sanitize_email, sanitize_string
 from utils.responses import *
-from utils.decorators import handle_errors, audit_log, rate_limit, validate_json
+from utils.decorators import handle_errors, audit_log, rate_limit, validate_json, guard
 from utils.logger import setup_logger
 from utils.http_client import ServiceClients
 from utils.cache import cache, cached, invalidate_cache
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 config = get_config()
 app.config.from_object(config)
 
@@ -53,12 +63,21 @@ jwt = JWTManager(app)
 db.init_app(app)
 metrics = PrometheusMetrics(app)
 
+# Surface lazy-load (N+1) regressions in development; nplusone is a dev-only dependency
+if config.DEBUG:
+    try:
+        from nplusone.ext.flask_sqlalchemy import NPlusOne
+        NPlusOne(app)
+    except ImportError:
+        pass
+
 # Setup logger
 logger = setup_logger('users-service')
 
-
-# Database initialization
-with app.app_context():
+# Database initialization (run once per deployment: flask --app services.users.app init-db)
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables."""
     db.create_all()
     logger.info("Users Service database initialized")
 
@@ -77,7 +96,7 @@ def health_check():
 @app.route('/api/auth/register', methods=['POST'])
 @handle_errors
 @validate_json
-@rate_limit(limit=10, window=3600)  # 10 registrations per hour
+@rate_limit(capacity=10, refill_per_sec=10 / 3600)  # 10 registrations per hour
 @audit_log('user_register', 'user')
 def register():
     """
@@ -105,7 +124,7 @@ def register():
             "role": "user"
         }
     """
-    data = request.get_json()
+    data = g.json
 
     # Validate required fields
     validate_required_fields(data, ['username', 'email', 'password', 'full_name'])
@@ -122,16 +141,19 @@ def register():
     validate_password(data['password'])
     validate_role(role)
 
-    # Check if username already exists
-    if User.query.filter_by(username=username).first():
+    # Check if username or email already exists in one round-trip (at most two rows match)
+    existing = db.session.execute(
+        db.select(User.username, User.email).where(or_(User.username == username, User.email == email))
+    ).all()
+
+    if any(row.username == username for row in existing):
         return conflict_response(f"Username '{username}' is already taken")
 
-    # Check if email already exists
-    if User.query.filter_by(email=email).first():
+    if existing:
         return conflict_response(f"Email '{email}' is already registered")
 
     # Hash password
-    password_hash = hash_password(data['password'])
+    password_hash = hash_password_async(data['password'])
 
     # Create user
     user = User(
@@ -143,8 +165,13 @@ def register():
         is_active=True
     )
 
-    db.session.add(user)
-    db.session.commit()
+    # Unique constraints are the final guard against a concurrent registration
+    try:
+        db.session.add(user)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return conflict_response("Username or email is already registered")
 
     # Generate tokens
     tokens = generate_tokens(user.id, user.username, user.role)
@@ -164,9 +191,7 @@ def register():
 
 
 @app.route('/api/auth/login', methods=['POST'])
-@handle_errors
-@validate_json
-@rate_limit(limit=20, window=300)  # 20 login attempts per 5 minutes
+@guard(json_body=True, capacity=20, refill_per_sec=20 / 300)  # 20 login attempts per 5 minutes
 def login():
     """
     User login.
@@ -187,7 +212,7 @@ def login():
             "password": "SecurePass123!"
         }
     """
-    data = request.get_json()
+    data = g.json
 
     validate_required_fields(data, ['username', 'password'])
 
@@ -209,40 +234,67 @@ def login():
         )
 
     # Verify password
-    if not verify_password(data['password'], user.password_hash):
-        # Increment failed attempts
-        user.failed_login_attempts += 1
+    if not verify_password_async(data['password'], user.password_hash):
+        # Increment failed attempts (and lock) in one statement so concurrent failures can't lose counts
+        attempts = User.failed_login_attempts + 1
+        lock_until = datetime.utcnow() + timedelta(seconds=config.ACCOUNT_LOCK_DURATION)
+        row = db.session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(
+                failed_login_attempts=attempts,
+                locked_until=case((attempts >= config.MAX_LOGIN_ATTEMPTS, lock_until), else_=User.locked_until)
+            )
+            .returning(User.failed_login_attempts)
+        ).first()
+        db.session.commit()
 
-        if user.failed_login_attempts >= config.MAX_LOGIN_ATTEMPTS:
-            user.locked_until = datetime.utcnow() + timedelta(seconds=config.ACCOUNT_LOCK_DURATION)
+        if row and row.failed_login_attempts >= config.MAX_LOGIN_ATTEMPTS:
             logger.warning(f"Account locked: {user.username}")
 
-        db.session.commit()
         return unauthorized_response("Invalid username or password")
 
     # Check if account is active
     if not user.is_active:
         return unauthorized_response("Account is disabled")
 
-    # Reset failed attempts and update last login
-    user.failed_login_attempts = 0
-    user.locked_until = None
-    user.last_login = datetime.utcnow()
+    # Read response fields before the commit expires the instance
+    user_data = {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'full_name': user.full_name,
+        'role': user.role
+    }
+
+    # Reset failed attempts and update last login in one statement
+    login_values = {'failed_login_attempts': 0, 'locked_until': None, 'last_login': datetime.utcnow()}
+
+    # Upgrade legacy bcrypt (or outdated argon2) hashes now that the plain password is known
+    if password_needs_rehash(user.password_hash):
+        login_values['password_hash'] = hash_password_async(data['password'])
+
+    db.session.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(**login_values)
+        .execution_options(synchronize_session=False)
+    )
     db.session.commit()
 
+    # Cached profiles carry last_login. Drop the user's own entries by exact key instead of
+    # pattern-scanning the keyspace; other viewers' copies expire within their 60 second TTL
+    user_id = user_data['id']
+    cache.delete(f'user:{user_id}:u{user_id}')
+    cache.delete(f'user_profile:{user_id}:u{user_id}')
+
     # Generate tokens
-    tokens = generate_tokens(user.id, user.username, user.role)
+    tokens = generate_tokens(user_data['id'], user_data['username'], user_data['role'])
 
-    logger.info(f"User logged in: {user.username}")
+    logger.info(f"User logged in: {user_data['username']}")
 
     return success_response({
-        'user': {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'full_name': user.full_name,
-            'role': user.role
-        },
+        'user': user_data,
         'tokens': tokens
     }, message="Login successful")
 
@@ -261,7 +313,7 @@ def refresh_token():
     current_user_id = get_jwt_identity()
     claims = get_jwt()
 
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, current_user_id)
     if not user or not user.is_active:
         return unauthorized_response("User not found or inactive")
 
@@ -271,11 +323,19 @@ def refresh_token():
     return success_response({'tokens': tokens}, message="Token refreshed successfully")
 
 
+# Columns returned by the user read endpoints; selected as plain rows, not ORM instances
+USER_READ_COLUMNS = (
+    User.id, User.username, User.email, User.full_name, User.role,
+    User.is_active, User.created_at, User.last_login
+)
+USER_READ_FIELDS = tuple(column.key for column in USER_READ_COLUMNS)
+USER_LIST_FIELDS = USER_READ_FIELDS + ('booking_count',)
+
+
 @app.route('/api/users', methods=['GET'])
 @jwt_required()
 @admin_required
-@handle_errors
-@rate_limit(limit=100, window=60)
+@guard(limit=100, window=60)
 def get_all_users():
     """
     Get all users (Admin only).
@@ -297,39 +357,38 @@ def get_all_users():
     role_filter = request.args.get('role')
     is_active = request.args.get('is_active')
 
-    query = User.query
+    page = max(page, 1)
+    per_page = max(per_page, 1)
 
     # Apply filters
+    filters = []
     if role_filter:
-        query = query.filter_by(role=role_filter)
+        filters.append(User.role == role_filter)
 
     if is_active is not None:
         is_active_bool = is_active.lower() == 'true'
-        query = query.filter_by(is_active=is_active_bool)
+        filters.append(User.is_active == is_active_bool)
 
-    # Order by creation date
-    query = query.order_by(User.created_at.desc())
+    total = db.session.execute(db.select(func.count(User.id)).where(*filters)).scalar()
 
-    # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Booking counts are aggregated in the same statement instead of one lookup per user
+    stmt = db.select(*USER_READ_COLUMNS, func.count(Booking.id).label('booking_count')) \
+        .outerjoin(Booking, Booking.user_id == User.id) \
+        .where(*filters) \
+        .group_by(User.id) \
+        .order_by(User.created_at.desc()) \
+        .limit(per_page) \
+        .offset((page - 1) * per_page)
 
-    users = [{
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'full_name': user.full_name,
-        'role': user.role,
-        'is_active': user.is_active,
-        'created_at': user.created_at.isoformat(),
-        'last_login': user.last_login.isoformat() if user.last_login else None
-    } for user in pagination.items]
+    users = [dict(zip(USER_LIST_FIELDS, row)) for row in db.session.execute(stmt).all()]
 
-    return paginated_response(users, page, per_page, pagination.total)
+    return paginated_response(users, page, per_page, total)
 
 
 @app.route('/api/users/<int:user_id>', methods=['GET'])
 @jwt_required()
 @handle_errors
+@cached(key_prefix='user', ttl=60, key_builder=lambda user_id: user_id, vary_on_user=True)
 def get_user(user_id):
     """
     Get user by ID.
@@ -345,25 +404,19 @@ def get_user(user_id):
     if current_user['user_id'] != user_id and current_user['role'] != 'admin':
         return forbidden_response("You can only view your own profile")
 
-    user = User.query.get(user_id)
+    user = db.session.execute(
+        db.select(*USER_READ_COLUMNS).where(User.id == user_id)
+    ).first()
     if not user:
         return not_found_response("User not found")
 
-    return success_response({
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'full_name': user.full_name,
-        'role': user.role,
-        'is_active': user.is_active,
-        'created_at': user.created_at.isoformat(),
-        'last_login': user.last_login.isoformat() if user.last_login else None
-    })
+    return success_response(dict(zip(USER_READ_FIELDS, user)))
 
 
 @app.route('/api/users/profile', methods=['GET'])
 @jwt_required()
 @handle_errors
+@cached(key_prefix='user_profile', ttl=60, key_builder=lambda: get_jwt().get('user_id'), vary_on_user=True)
 def get_profile():
     """
     Get current user's profile.
@@ -373,28 +426,19 @@ def get_profile():
         404: User not found
     """
     current_user = get_current_user()
-    user = User.query.get(current_user['user_id'])
+    user = db.session.execute(
+        db.select(*USER_READ_COLUMNS).where(User.id == current_user['user_id'])
+    ).first()
 
     if not user:
         return not_found_response("User not found")
 
-    return success_response({
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'full_name': user.full_name,
-        'role': user.role,
-        'is_active': user.is_active,
-        'created_at': user.created_at.isoformat(),
-        'last_login': user.last_login.isoformat() if user.last_login else None
-    })
+    return success_response(dict(zip(USER_READ_FIELDS, user)))
 
 
 @app.route('/api/users/profile', methods=['PUT'])
 @jwt_required()
-@handle_errors
-@validate_json
-@audit_log('update_profile', 'user')
+@guard(json_body=True, audit='update_profile', resource_type='user')
 def update_profile():
     """
     Update current user's profile.
@@ -410,12 +454,12 @@ def update_profile():
         409: Email already in use
     """
     current_user = get_current_user()
-    user = User.query.get(current_user['user_id'])
+    user = db.session.get(User, current_user['user_id'])
 
     if not user:
         return not_found_response("User not found")
 
-    data = request.get_json()
+    data = g.json
 
     # Update email
     if 'email' in data:
@@ -423,8 +467,10 @@ def update_profile():
         new_email = validate_email_format(new_email)
 
         # Check if email is already used by another user
-        existing_user = User.query.filter_by(email=new_email).first()
-        if existing_user and existing_user.id != user.id:
+        email_taken = db.session.execute(
+            db.select(User.id).where(User.email == new_email, User.id != user.id)
+        ).first()
+        if email_taken:
             return conflict_response("Email is already in use")
 
         user.email = new_email
@@ -436,12 +482,17 @@ def update_profile():
     # Update password
     if 'password' in data:
         validate_password(data['password'])
-        user.password_hash = hash_password(data['password'])
+        user.password_hash = hash_password_async(data['password'])
 
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return conflict_response("Email is already in use")
 
     # Invalidate cache
     invalidate_cache(f'user:{user.id}')
+    invalidate_cache(f'user_profile:{user.id}')
 
     logger.info(f"Profile updated: {user.username}")
 
@@ -457,8 +508,7 @@ def update_profile():
 @app.route('/api/users/<int:user_id>', methods=['DELETE'])
 @jwt_required()
 @admin_required
-@handle_errors
-@audit_log('delete_user', 'user')
+@guard(audit='delete_user', resource_type='user')
 def delete_user(user_id):
     """
     Delete a user (Admin only).
@@ -473,7 +523,7 @@ def delete_user(user_id):
     if current_user['user_id'] == user_id:
         return forbidden_response("You cannot delete your own account")
 
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return not_found_response("User not found")
 
@@ -483,16 +533,34 @@ def delete_user(user_id):
 
     # Invalidate cache
     invalidate_cache(f'user:{user_id}')
+    invalidate_cache(f'user_profile:{user_id}')
 
     logger.info(f"User deleted: {username}")
 
     return success_response(message=f"User '{username}' deleted successfully")
 
 
+# Booking history pages are cached per owner and page, shared by the owner and admins
+BOOKINGS_PAGE_SIZE = 20
+BOOKINGS_CACHE_TTL = 300
+
+BOOKING_LIST_COLUMNS = (
+    Booking.id, Booking.room_id, Room.name.label('room_name'), Booking.title,
+    Booking.start_time, Booking.end_time, Booking.status, Booking.created_at
+)
+BOOKING_LIST_FIELDS = ('id', 'room_id', 'room_name', 'title', 'start_time', 'end_time', 'status', 'created_at')
+
+
+def _bookings_page_args():
+    """Return the normalized (page, per_page) of a booking history request."""
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = max(min(request.args.get('per_page', BOOKINGS_PAGE_SIZE, type=int), 100), 1)
+    return page, per_page
+
+
 @app.route('/api/users/<int:user_id>/bookings', methods=['GET'])
 @jwt_required()
 @handle_errors
-@cached(key_prefix='user_bookings', ttl=300)
 def get_user_bookings(user_id):
     """
     Get user's booking history.
@@ -512,28 +580,35 @@ def get_user_bookings(user_id):
     if current_user['user_id'] != user_id and current_user['role'] != 'admin':
         return forbidden_response("You can only view your own bookings")
 
-    user = User.query.get(user_id)
-    if not user:
+    # A user's own token already proves the account exists; only admins looking up others need the check
+    if current_user['user_id'] != user_id and db.session.get(User, user_id) is None:
         return not_found_response("User not found")
 
-    page = request.args.get('page', 1, type=int)
-    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    page, per_page = _bookings_page_args()
+
+    # Read only after the access checks; lives under user_bookings:<id> so booking writes invalidate it
+    cache_key = f'user_bookings:{user_id}:{page}:{per_page}'
+    cached_page = cache.get(cache_key)
+    if cached_page is not None:
+        return paginated_response(cached_page['bookings'], page, per_page, cached_page['total'])
+
+    # Get bookings with their room names in the same statement
+    total = db.session.execute(
+        db.select(func.count(Booking.id)).where(Booking.user_id == user_id)
+    ).scalar()
+
+    stmt = db.select(*BOOKING_LIST_COLUMNS) \
+        .join(Room, Booking.room_id == Room.id) \
+        .where(Booking.user_id == user_id) \
+        .order_by(Booking.created_at.desc()) \
+        .limit(per_page) \
+        .offset((page - 1) * per_page)
+
+    bookings = [dict(zip(BOOKING_LIST_FIELDS, row)) for row in db.session.execute(stmt).all()]
+
+    cache.set(cache_key, {'bookings': bookings, 'total': total}, BOOKINGS_CACHE_TTL)
 
-    # Get bookings
-    query = Booking.query.filter_by(user_id=user_id).order_by(Booking.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-
-    bookings = [{
-        'id': booking.id,
-        'room_id': booking.room_id,
-        'title': booking.title,
-        'start_time': booking.start_time.isoformat(),
-        'end_time': booking.end_time.isoformat(),
-        'status': booking.status,
-        'created_at': booking.created_at.isoformat()
-    } for booking in pagination.items]
-
-    return paginated_response(bookings, page, per_page, pagination.total)
+    return paginated_response(bookings, page, per_page, total)
 
 
 if __name__ == '__main__':
@@ -10,6 +10,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from flask import Flask
+from sqlalchemy import event
 from database.models import db, User, Room, Booking, Review
 from configs.config import TestingConfig
 from utils.auth import hash_password, generate_tokens
@@ -25,6 +26,16 @@ def app():
     db.init_app(app)
 
     with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            # pysqlite does not emit BEGIN itself, which breaks SAVEPOINT handling
+            @event.listens_for(db.engine, 'connect')
+            def disable_pysqlite_transactions(dbapi_connection, connection_record):
+                dbapi_connection.isolation_level = None
+
+            @event.listens_for(db.engine, 'begin')
+            def emit_begin(connection):
+                connection.exec_driver_sql('BEGIN')
+
         db.create_all()
         yield app
         db.session.remove()
@@ -39,12 +50,31 @@ def client(app):
 
 @pytest.fixture(scope='function')
 def db_session(app):
-    """Create database session for testing."""
+    """
+    Create database session for testing.
+
+    The schema is created once per session; each test runs inside an outer
+    transaction that is rolled back afterwards, and session commits only
+    release SAVEPOINTs within it.
+    """
     with app.app_context():
-        db.create_all()
+        connection = db.engine.connect()
+        transaction = connection.begin()
+
+        # Flask-SQLAlchemy resolves binds from db.engines, not Session.bind
+        engines = db.engines
+        engine = engines[None]
+        engines[None] = connection
+
+        db.session.remove()
+        db.session.configure(join_transaction_mode='create_savepoint')
+
         yield db.session
-        db.session.rollback()
+
         db.session.remove()
+        engines[None] = engine
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture
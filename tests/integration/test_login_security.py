@@ -0,0 +1,178 @@
+"""
+Integration tests for login lockout and password hash upgrades.
+"""
+
+import bcrypt
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from database.models import db, User
+from services.users import app as users_service
+from utils import auth, decorators
+from utils.cache import cache
+from utils.decorators import TokenBucketRateLimiter
+
+PASSWORD = 'SecurePass123!'
+
+
+@pytest.fixture
+def users_app(monkeypatch):
+    """Users service backed by a private in-memory database, without Redis or hashing workers."""
+    app = users_service.app
+    monkeypatch.setitem(app.config, 'AUDIT_LOG_ASYNC', False)
+    monkeypatch.setattr(users_service.config, 'MAX_LOGIN_ATTEMPTS', 3)
+    monkeypatch.setattr(auth.Config, 'PASSWORD_HASH_POOL_WORKERS', 0)
+    monkeypatch.setattr(cache, '_enabled', False)
+    monkeypatch.setattr(decorators, 'rate_limiter', TokenBucketRateLimiter())
+
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    with app.app_context():
+        engines = db.engines
+        original = engines[None]
+        engines[None] = engine
+        db.create_all()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        engines[None] = original
+    engine.dispose()
+
+
+def _create_user(app, password_hash):
+    """Insert an active user and return its id."""
+    with app.app_context():
+        user = User(username='alice', email='alice@example.com', password_hash=password_hash,
+                    full_name='Alice', role='user', is_active=True)
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        db.session.remove()
+    return user_id
+
+
+def _user_state(app, user_id):
+    """Read the login bookkeeping columns for a user."""
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        state = {
+            'failed_login_attempts': user.failed_login_attempts,
+            'locked_until': user.locked_until,
+            'last_login': user.last_login,
+            'password_hash': user.password_hash
+        }
+        db.session.remove()
+    return state
+
+
+def _login(client, password):
+    """Post a login for alice."""
+    return client.post('/api/auth/login', json={'username': 'alice', 'password': password})
+
+
+class TestLoginLockout:
+    """Test failed-login counting and account lockout."""
+
+    def test_locked_after_max_failures(self, users_app):
+        """Test the account locks after MAX_LOGIN_ATTEMPTS failures, even for the right password."""
+        user_id = _create_user(users_app, auth.hash_password(PASSWORD))
+        client = users_app.test_client()
+
+        for attempt in range(1, 4):
+            response = _login(client, 'WrongPass123!')
+            assert response.status_code == 401
+            assert _user_state(users_app, user_id)['failed_login_attempts'] == attempt
+
+        state = _user_state(users_app, user_id)
+        assert state['locked_until'] is not None
+        assert state['locked_until'] > datetime.utcnow()
+
+        response = _login(client, PASSWORD)
+        assert response.status_code == 401
+        assert 'locked' in response.get_json()['error']
+
+    def test_success_resets_counter(self, users_app):
+        """Test a successful login clears earlier failures and records last_login."""
+        user_id = _create_user(users_app, auth.hash_password(PASSWORD))
+        client = users_app.test_client()
+
+        for _ in range(2):
+            assert _login(client, 'WrongPass123!').status_code == 401
+        assert _user_state(users_app, user_id)['failed_login_attempts'] == 2
+
+        response = _login(client, PASSWORD)
+        assert response.status_code == 200
+        assert 'access_token' in response.get_json()['data']['tokens']
+
+        state = _user_state(users_app, user_id)
+        assert state['failed_login_attempts'] == 0
+        assert state['locked_until'] is None
+        assert state['last_login'] is not None
+
+        # The reset means two more failures do not lock the account
+        for _ in range(2):
+            assert _login(client, 'WrongPass123!').status_code == 401
+        assert _user_state(users_app, user_id)['locked_until'] is None
+
+    def test_expired_lock_allows_login(self, users_app):
+        """Test a lock in the past no longer blocks the correct password."""
+        user_id = _create_user(users_app, auth.hash_password(PASSWORD))
+        with users_app.app_context():
+            user = db.session.get(User, user_id)
+            user.failed_login_attempts = 3
+            user.locked_until = datetime.utcnow() - timedelta(minutes=1)
+            db.session.commit()
+            db.session.remove()
+
+        assert _login(users_app.test_client(), PASSWORD).status_code == 200
+        assert _user_state(users_app, user_id)['failed_login_attempts'] == 0
+
+
+class TestLoginCacheInvalidation:
+    """Test a successful login evicts the user's cached profiles cheaply."""
+
+    def test_deletes_exact_profile_keys(self, users_app, monkeypatch):
+        """Test login deletes the user's own profile keys without a pattern scan."""
+        user_id = _create_user(users_app, auth.hash_password(PASSWORD))
+        deleted = []
+        monkeypatch.setattr(cache, 'delete', deleted.append)
+
+        def scan(pattern):
+            raise AssertionError(f'login scanned for {pattern}')
+
+        monkeypatch.setattr(cache, 'delete_pattern', scan)
+
+        assert _login(users_app.test_client(), PASSWORD).status_code == 200
+        assert deleted == [f'user:{user_id}:u{user_id}', f'user_profile:{user_id}:u{user_id}']
+
+
+class TestPasswordRehash:
+    """Test legacy bcrypt hashes are upgraded on login."""
+
+    def test_bcrypt_hash_rewritten_as_argon2id(self, users_app):
+        """Test a successful login replaces a bcrypt hash with an argon2id hash."""
+        legacy_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+        user_id = _create_user(users_app, legacy_hash)
+        client = users_app.test_client()
+
+        assert _login(client, PASSWORD).status_code == 200
+
+        new_hash = _user_state(users_app, user_id)['password_hash']
+        assert new_hash.startswith('$argon2id$')
+        assert not auth.password_needs_rehash(new_hash)
+        assert auth.verify_password(PASSWORD, new_hash)
+
+        # The upgraded hash keeps working and still rejects wrong passwords
+        assert _login(client, PASSWORD).status_code == 200
+        assert _login(client, 'WrongPass123!').status_code == 401
+        assert _user_state(users_app, user_id)['password_hash'] == new_hash
+
+    def test_failed_login_keeps_bcrypt_hash(self, users_app):
+        """Test a wrong password never triggers a rehash."""
+        legacy_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+        user_id = _create_user(users_app, legacy_hash)
+
+        assert _login(users_app.test_client(), 'WrongPass123!').status_code == 401
+        assert _user_state(users_app, user_id)['password_hash'] == legacy_hash
@@ -0,0 +1,186 @@
+"""
+Unit tests for the batched audit log writer.
+"""
+
+import queue
+import threading
+import pytest
+from datetime import datetime
+from flask import Flask
+from database.models import db, AuditLog
+from configs.config import TestingConfig
+from utils.audit_queue import AuditLogQueue, _STOP, _copy_field
+from utils.decorators import audit_log
+
+
+def _row(action='test_action'):
+    """Build a minimal audit row."""
+    now = datetime(2025, 1, 2, 3, 4, 5)
+    return {
+        'user_id': None,
+        'service': 'tests',
+        'action': action,
+        'resource_type': None,
+        'ip_address': '127.0.0.1',
+        'user_agent': None,
+        'success': True,
+        'error_message': None,
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+@pytest.fixture
+def audit_rows(app):
+    """Yield a function counting audit rows; rows are deleted afterwards."""
+    def count(action=None):
+        with app.app_context():
+            query = AuditLog.query
+            if action is not None:
+                query = query.filter_by(action=action)
+            return query.count()
+
+    yield count
+
+    with app.app_context():
+        AuditLog.query.delete()
+        db.session.commit()
+        db.session.remove()
+
+
+class TestCopyField:
+    """Test COPY CSV field encoding."""
+
+    def test_none_is_unquoted_empty(self):
+        """Test NULL is the only unquoted field."""
+        assert _copy_field(None) == ''
+        assert _copy_field('') == '""'
+
+    def test_booleans(self):
+        """Test booleans use PostgreSQL's t/f literals."""
+        assert _copy_field(True) == 't'
+        assert _copy_field(False) == 'f'
+
+    def test_datetime(self):
+        """Test datetimes are written in ISO format."""
+        assert _copy_field(datetime(2025, 1, 2, 3, 4, 5)) == '2025-01-02T03:04:05'
+
+    def test_quotes_are_doubled(self):
+        """Test embedded quotes, separators and newlines stay inside one field."""
+        assert _copy_field('say "hi"') == '"say ""hi"""'
+        assert _copy_field('a,b\nc') == '"a,b\nc"'
+        assert _copy_field(42) == '"42"'
+
+
+class TestBatching:
+    """Test how the writer groups queued rows."""
+
+    def _queue(self, batch_size=3):
+        audit_queue = AuditLogQueue()
+        audit_queue.queue = queue.Queue()
+        audit_queue.batch_size = batch_size
+        audit_queue.flush_interval = 0.05
+        return audit_queue
+
+    def test_batches_are_capped_at_batch_size(self):
+        """Test queued rows are split into batch_size batches."""
+        audit_queue = self._queue()
+        for i in range(7):
+            audit_queue.queue.put(_row(f'a{i}'))
+
+        sizes = []
+        for _ in range(3):
+            rows, stopping = audit_queue._next_batch()
+            assert not stopping
+            sizes.append(len(rows))
+
+        assert sizes == [3, 3, 1]
+
+    def test_stop_sentinel_ends_batch(self):
+        """Test rows queued before the sentinel are returned with stopping set."""
+        audit_queue = self._queue()
+        audit_queue.queue.put(_row())
+        audit_queue.queue.put(_STOP)
+
+        rows, stopping = audit_queue._next_batch()
+        assert len(rows) == 1
+        assert stopping
+
+    def test_stop_sentinel_alone(self):
+        """Test the sentinel on an empty queue yields no rows."""
+        audit_queue = self._queue()
+        audit_queue.queue.put(_STOP)
+
+        assert audit_queue._next_batch() == ([], True)
+
+
+class TestQueueLifecycle:
+    """Test enqueueing and shutdown."""
+
+    def test_put_returns_false_when_full(self, app):
+        """Test a full queue hands the row back to the caller."""
+        audit_queue = AuditLogQueue()
+        audit_queue.app = app
+        audit_queue.queue = queue.Queue(maxsize=1)
+        # A placeholder thread keeps put() from starting a real writer
+        audit_queue._thread = threading.Thread(target=lambda: None)
+
+        assert audit_queue.put(app, _row()) is True
+        assert audit_queue.put(app, _row()) is False
+
+    def test_stop_writes_every_row_once(self, app, audit_rows):
+        """Test stop() ends the writer thread and no queued row is lost or duplicated."""
+        app.config['AUDIT_BATCH_SIZE'] = 4
+        app.config['AUDIT_FLUSH_INTERVAL'] = 0.01
+        audit_queue = AuditLogQueue()
+        try:
+            for _ in range(10):
+                assert audit_queue.put(app, _row('lifecycle'))
+
+            audit_queue.stop()
+        finally:
+            app.config.pop('AUDIT_BATCH_SIZE')
+            app.config.pop('AUDIT_FLUSH_INTERVAL')
+
+        assert not audit_queue._thread.is_alive()
+        assert audit_rows('lifecycle') == 10
+
+    def test_stop_without_writer(self):
+        """Test stop() on a queue that never started is a no-op."""
+        AuditLogQueue().stop()
+
+
+class TestFullQueueFallback:
+    """Test rows rejected by a full queue are written at the end of the request."""
+
+    @pytest.fixture
+    def audited_app(self, monkeypatch):
+        """App with one audited route whose queue always reports full."""
+        audited_app = Flask(__name__)
+        audited_app.config.from_object(TestingConfig)
+        audited_app.config['AUDIT_LOG_ASYNC'] = True
+        db.init_app(audited_app)
+
+        @audited_app.route('/audited', methods=['POST'])
+        @audit_log('full_queue', 'test')
+        def audited():
+            return 'ok'
+
+        monkeypatch.setattr('utils.decorators.audit_queue.put', lambda app, row: False)
+
+        with audited_app.app_context():
+            db.create_all()
+        yield audited_app
+        with audited_app.app_context():
+            db.drop_all()
+            db.session.remove()
+
+    def test_row_written_synchronously(self, audited_app):
+        """Test the request still produces its audit row."""
+        response = audited_app.test_client().post('/audited')
+        assert response.status_code == 200
+
+        with audited_app.app_context():
+            rows = AuditLog.query.filter_by(action='full_queue').all()
+            assert len(rows) == 1
+            assert rows[0].success is True
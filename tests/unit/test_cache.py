@@ -0,0 +1,282 @@
+"""
+Unit tests for caching utilities.
+"""
+
+import fnmatch
+import inspect
+import orjson
+import pytest
+from cachetools import TTLCache
+from flask import Flask
+from utils.cache import RedisCache, _compile_args_key
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis-py calls RedisCache makes; counts reads."""
+
+    def __init__(self):
+        self.data = {}
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self.reads += 1
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    def unlink(self, key):
+        return self.delete(key)
+
+    def scan_iter(self, match='*', count=None):
+        return iter([key for key in self.data if fnmatch.fnmatchcase(key, match)])
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Pipeline that runs queued UNLINKs on execute()."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.keys = []
+
+    def unlink(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        results = [self.redis_client.unlink(key) for key in self.keys]
+        self.keys = []
+        return results
+
+
+@pytest.fixture
+def clock():
+    """Manual timer for the L1; advance by assigning to clock[0]."""
+    return [0.0]
+
+
+@pytest.fixture
+def redis_cache(clock):
+    """RedisCache wired to a FakeRedis with a 5 second L1."""
+    redis_cache = RedisCache()
+    redis_cache.redis_client = FakeRedis()
+    redis_cache.enabled = True
+    redis_cache.l1 = TTLCache(maxsize=16, ttl=5, timer=lambda: clock[0])
+    return redis_cache
+
+
+class TestArgsKey:
+    """Test the generated argument binder used for default cache keys."""
+
+    def test_positional_and_keyword_spellings_match(self):
+        """Test one call spelled positionally or by keyword binds to one key."""
+        def func(room_id, page, per_page=20):
+            pass
+
+        args_key = _compile_args_key(func)
+        assert args_key(1, 2, 20) == args_key(1, page=2) == args_key(room_id=1, per_page=20, page=2)
+        assert args_key(1, 2) == (1, 2, 20)
+
+    def test_defaults_fill_in(self):
+        """Test omitted arguments take the function's defaults."""
+        def func(a, b=2, *, c=3, d=None):
+            pass
+
+        args_key = _compile_args_key(func)
+        assert args_key(1) == (1, 2, 3, None)
+        assert args_key(1, c=3) == args_key(1, 2, d=None)
+        assert args_key(1, d='x') == (1, 2, 3, 'x')
+
+    def test_positional_only_then_keyword_only(self):
+        """Test '/' is emitted before '*' so the signature mirrors func's."""
+        def func(a, /, *, c=1):
+            pass
+
+        args_key = _compile_args_key(func)
+        assert inspect.signature(args_key).parameters['a'].kind is inspect.Parameter.POSITIONAL_ONLY
+        assert args_key(5) == args_key(5, c=1) == (5, 1)
+        with pytest.raises(TypeError):
+            args_key(a=5)
+
+    def test_positional_only_then_regular(self):
+        """Test a regular parameter after '/' accepts either spelling."""
+        def func(a, /, b, c=0):
+            pass
+
+        args_key = _compile_args_key(func)
+        assert args_key(1, 2) == args_key(1, b=2) == args_key(1, 2, 0) == (1, 2, 0)
+
+    def test_signature_matches_function(self):
+        """Test the binder's parameter kinds and order match the function's."""
+        def func(a, b=1, /, c=2, *, d, e=3):
+            pass
+
+        expected = [(p.name, p.kind) for p in inspect.signature(func).parameters.values()]
+        actual = [(p.name, p.kind) for p in inspect.signature(_compile_args_key(func)).parameters.values()]
+        assert actual == expected
+
+    def test_var_args_not_compiled(self):
+        """Test functions taking *args or **kwargs fall back to the generic key."""
+        def with_args(*args):
+            pass
+
+        def with_kwargs(a, **kwargs):
+            pass
+
+        assert _compile_args_key(with_args) is None
+        assert _compile_args_key(with_kwargs) is None
+
+
+class TestL1:
+    """Test the per-process L1 in front of Redis."""
+
+    def test_hit_served_from_l1(self, redis_cache):
+        """Test a repeated read costs one Redis round-trip."""
+        redis_cache.redis_client.data['k'] = orjson.dumps({'a': 1})
+
+        assert redis_cache.get('k') == {'a': 1}
+        assert redis_cache.get('k') == {'a': 1}
+        assert redis_cache.redis_client.reads == 1
+        assert (redis_cache.l1_hits, redis_cache.l1_misses) == (1, 1)
+
+    def test_hits_are_independent_copies(self, redis_cache):
+        """Test mutating a returned value does not change later hits."""
+        redis_cache.redis_client.data['k'] = orjson.dumps({'items': [1, 2]})
+
+        first = redis_cache.get('k')
+        first['items'].append(3)
+        first['extra'] = True
+
+        assert redis_cache.get('k') == {'items': [1, 2]}
+        assert redis_cache.get('k') is not redis_cache.get('k')
+
+    def test_misses_not_remembered(self, redis_cache):
+        """Test a Redis miss is not cached in the L1."""
+        assert redis_cache.get('k') is None
+        redis_cache.redis_client.data['k'] = orjson.dumps(1)
+        assert redis_cache.get('k') == 1
+
+    def test_entries_expire(self, redis_cache, clock):
+        """Test a write the L1 cannot see shows up once the entry expires."""
+        redis_cache.redis_client.data['k'] = orjson.dumps('old')
+        assert redis_cache.get('k') == 'old'
+
+        # Another process rewrites the key in Redis
+        redis_cache.redis_client.data['k'] = orjson.dumps('new')
+        assert redis_cache.get('k') == 'old'
+
+        clock[0] = 6
+        assert redis_cache.get('k') == 'new'
+
+    def test_set_and_delete_drop_l1_entry(self, redis_cache):
+        """Test this process's own writes are seen immediately."""
+        redis_cache.set('k', 'old')
+        assert redis_cache.get('k') == 'old'
+
+        redis_cache.set('k', 'new')
+        assert redis_cache.get('k') == 'new'
+
+        redis_cache.delete('k')
+        assert redis_cache.get('k') is None
+
+    def test_l1_discard_pattern(self, redis_cache):
+        """Test _l1_discard drops exactly the keys matching a glob."""
+        for key in ('rooms:1', 'rooms:2', 'rooms', 'bookings:1'):
+            redis_cache._l1_put(key, b'1')
+
+        redis_cache._l1_discard('rooms:*')
+        assert sorted(redis_cache.l1) == ['bookings:1', 'rooms']
+
+        redis_cache._l1_discard('rooms')
+        assert sorted(redis_cache.l1) == ['bookings:1']
+
+    def test_delete_pattern_clears_l1(self, redis_cache):
+        """Test delete_pattern removes matching keys from Redis and the L1."""
+        for key in ('rooms:1', 'bookings:1'):
+            redis_cache.set(key, key)
+            redis_cache.get(key)
+
+        assert redis_cache.delete_pattern('rooms:*') == 1
+        assert list(redis_cache.l1) == ['bookings:1']
+        assert redis_cache.get('rooms:1') is None
+
+
+class TestMgetAndPrefetch:
+    """Test batched reads and the request-local prefetch."""
+
+    @pytest.fixture
+    def request_context(self):
+        """Active request context for g-backed prefetch."""
+        with Flask(__name__).test_request_context():
+            yield
+
+    def test_mget_order_and_misses(self, redis_cache):
+        """Test values come back in key order with None for misses."""
+        redis_cache.redis_client.data.update(a=orjson.dumps(1), c=orjson.dumps([3]))
+
+        assert redis_cache.mget(['a', 'b', 'c']) == [1, None, [3]]
+        assert redis_cache.redis_client.reads == 1
+
+    def test_mget_only_fetches_l1_misses(self, redis_cache):
+        """Test keys held in the L1 are not requested from Redis again."""
+        redis_cache.redis_client.data.update(a=orjson.dumps(1), b=orjson.dumps(2))
+        redis_cache.get('a')
+
+        fetched = []
+        mget = redis_cache.redis_client.mget
+        redis_cache.redis_client.mget = lambda keys: fetched.append(list(keys)) or mget(keys)
+
+        assert redis_cache.mget(['a', 'b']) == [1, 2]
+        assert fetched == [['b']]
+        assert redis_cache.mget(['a', 'b']) == [1, 2]
+        assert fetched == [['b']]
+
+    def test_mget_empty_and_error(self, redis_cache):
+        """Test an empty key list skips Redis and a Redis error reads as all misses."""
+        assert redis_cache.mget([]) == []
+        assert redis_cache.redis_client.reads == 0
+
+        def fail(keys):
+            raise ConnectionError('redis down')
+
+        redis_cache.redis_client.mget = fail
+        assert redis_cache.mget(['a', 'b']) == [None, None]
+
+    def test_prefetch_answers_later_gets(self, redis_cache, request_context):
+        """Test prefetched hits and misses cost no further round-trips."""
+        redis_cache.redis_client.data['a'] = orjson.dumps({'id': 1})
+
+        redis_cache.prefetch(['a', 'b'])
+        assert redis_cache.redis_client.reads == 1
+
+        assert redis_cache.get('a') == {'id': 1}
+        assert redis_cache.get('b') is None
+        assert redis_cache.redis_client.reads == 1
+
+    def test_prefetch_outside_request(self, redis_cache):
+        """Test prefetch is a no-op without a request context."""
+        redis_cache.prefetch(['a'])
+        assert redis_cache.redis_client.reads == 0
+
+    def test_set_and_delete_update_prefetched_entries(self, redis_cache, request_context):
+        """Test writes in the request replace its prefetched values."""
+        redis_cache.redis_client.data['a'] = orjson.dumps('old')
+        redis_cache.prefetch(['a', 'b'])
+
+        redis_cache.set('a', 'new')
+        redis_cache.set('b', {'created': True})
+        assert redis_cache.get('a') == 'new'
+        assert redis_cache.get('b') == {'created': True}
+
+        redis_cache.delete('a')
+        assert redis_cache.get('a') is None
+        assert redis_cache.redis_client.reads == 1
@@ -0,0 +1,217 @@
+"""
+Unit tests for route decorators.
+"""
+
+import pytest
+from flask import Flask
+from database.models import db, AuditLog, Room
+from configs.config import TestingConfig
+from utils import decorators
+from utils.cache import cache
+from utils.decorators import TokenBucketRateLimiter, audit_log, guard, handle_errors
+
+
+@pytest.fixture
+def decorated_app():
+    """App whose audit rows are written synchronously at the end of each request."""
+    decorated_app = Flask(__name__)
+    decorated_app.config.from_object(TestingConfig)
+    decorated_app.config['AUDIT_LOG_ASYNC'] = False
+    db.init_app(decorated_app)
+
+    with decorated_app.app_context():
+        db.create_all()
+    yield decorated_app
+    with decorated_app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def audit_writes(monkeypatch):
+    """Record every batch handed to write_audit_rows."""
+    batches = []
+    write_audit_rows = decorators.write_audit_rows
+
+    def record(rows):
+        batches.append(list(rows))
+        write_audit_rows(rows)
+
+    monkeypatch.setattr(decorators, 'write_audit_rows', record)
+    return batches
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the rate limiter's monotonic clock; returns a function advancing it by milliseconds."""
+    now = [10 ** 12]
+    monkeypatch.setattr(decorators.time, 'monotonic_ns', lambda: now[0])
+
+    def advance(ms):
+        now[0] += ms * 1_000_000
+
+    return advance
+
+
+@pytest.fixture
+def limiter(monkeypatch, clock):
+    """Fresh in-process rate limiter with Redis disabled."""
+    monkeypatch.setattr(cache, '_enabled', False)
+    limiter = TokenBucketRateLimiter(shards=1, max_keys=100)
+    monkeypatch.setattr(decorators, 'rate_limiter', limiter)
+    return limiter
+
+
+class TestTokenBucket:
+    """Test the in-process token bucket."""
+
+    def test_burst_up_to_capacity(self, limiter):
+        """Test a new bucket allows capacity requests back to back."""
+        results = [limiter.take('k', 3, 1.0) for _ in range(4)]
+        assert results == [(True, 2), (True, 1), (True, 0), (False, 0)]
+
+    def test_refill_rate(self, limiter, clock):
+        """Test tokens come back at refill_per_sec."""
+        for _ in range(2):
+            limiter.take('k', 2, 2.0)
+
+        clock(250)
+        assert limiter.take('k', 2, 2.0) == (False, 0.5)
+        clock(250)
+        assert limiter.take('k', 2, 2.0) == (True, 0)
+
+    def test_refill_capped_at_capacity(self, limiter, clock):
+        """Test an idle bucket never holds more than capacity tokens."""
+        limiter.take('k', 3, 1.0)
+        clock(60_000)
+        assert limiter.take('k', 3, 1.0) == (True, 2)
+
+    def test_evicts_refilled_buckets(self, limiter, clock):
+        """Test buckets that have refilled completely are dropped."""
+        buckets, _ = limiter.shards[0]
+        limiter.take('a', 1, 1.0)
+        clock(500)
+        limiter.take('b', 1, 1.0)
+        assert list(buckets) == ['a', 'b']
+
+        clock(600)
+        limiter.take('c', 1, 1.0)
+        assert list(buckets) == ['b', 'c']
+
+    def test_shard_size_cap(self, limiter):
+        """Test a shard drops its least recently used bucket beyond max_keys_per_shard."""
+        limiter.max_keys_per_shard = 2
+        buckets, _ = limiter.shards[0]
+        limiter.take('a', 5, 1.0)
+        limiter.take('b', 5, 1.0)
+        limiter.take('a', 5, 1.0)
+        limiter.take('c', 5, 1.0)
+
+        assert list(buckets) == ['a', 'c']
+        assert buckets['a'][0] == 3
+
+
+class TestGuard:
+    """Test guard stage ordering and responses."""
+
+    def test_retry_after(self, decorated_app, limiter, clock):
+        """Test a 429 reports when the next token is due."""
+        @decorated_app.route('/limited')
+        @guard(capacity=2, refill_per_sec=0.5)
+        def limited():
+            return 'ok'
+
+        client = decorated_app.test_client()
+        assert client.get('/limited').status_code == 200
+        assert client.get('/limited').status_code == 200
+
+        response = client.get('/limited')
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '2'
+
+        clock(1000)
+        response = client.get('/limited')
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '1'
+
+    def test_non_object_body_rejected_before_audit(self, decorated_app, limiter, audit_writes):
+        """Test a JSON array body gets a 400 and no audit row."""
+        @decorated_app.route('/create', methods=['POST'])
+        @guard(json_body=True, audit='create', resource_type='test', limit=5, window=60)
+        def create():
+            return 'ok'
+
+        response = decorated_app.test_client().post('/create', json=[1, 2])
+        assert response.status_code == 400
+        assert audit_writes == []
+
+    def test_rate_limited_request_not_audited(self, decorated_app, limiter, audit_writes):
+        """Test only requests that pass the rate limit are audited."""
+        @decorated_app.route('/create', methods=['POST'])
+        @guard(json_body=True, audit='create', resource_type='test', capacity=1, refill_per_sec=0.01)
+        def create():
+            return 'ok'
+
+        client = decorated_app.test_client()
+        assert client.post('/create', json={}).status_code == 200
+        assert client.post('/create', json={}).status_code == 429
+
+        assert len(audit_writes) == 1
+        with decorated_app.app_context():
+            assert AuditLog.query.count() == 1
+
+
+class TestRequestAuditRows:
+    """Test audit rows deferred to the end of the request."""
+
+    def test_one_batch_per_request(self, decorated_app, audit_writes):
+        """Test every row recorded during a request is written in one batch."""
+        @decorated_app.route('/nested', methods=['POST'])
+        @audit_log('outer', 'test')
+        @audit_log('inner', 'test')
+        def nested():
+            return 'ok'
+
+        response = decorated_app.test_client().post('/nested')
+        assert response.status_code == 200
+
+        assert len(audit_writes) == 1
+        assert [row['action'] for row in audit_writes[0]] == ['inner', 'outer']
+        with decorated_app.app_context():
+            assert AuditLog.query.count() == 2
+
+    def test_view_exception_writes_failed_row(self, decorated_app, audit_writes):
+        """Test a failing view still gets its audit row and its own changes are not committed."""
+        @decorated_app.route('/fails', methods=['POST'])
+        @handle_errors
+        @audit_log('fails', 'room')
+        def fails():
+            db.session.add(Room(name='Never Saved', capacity=4))
+            raise ValueError('boom')
+
+        response = decorated_app.test_client().post('/fails')
+        assert response.status_code == 500
+
+        assert len(audit_writes) == 1
+        with decorated_app.app_context():
+            row = AuditLog.query.one()
+            assert row.success is False
+            assert row.error_message == 'boom'
+            assert Room.query.count() == 0
+
+    def test_failed_write_is_logged_and_dropped(self, decorated_app, monkeypatch):
+        """Test a failing audit write does not change the response."""
+        def fail(rows):
+            raise RuntimeError('database unavailable')
+
+        monkeypatch.setattr(decorators, 'write_audit_rows', fail)
+
+        @decorated_app.route('/dropped', methods=['POST'])
+        @audit_log('dropped', 'test')
+        def dropped():
+            return 'ok'
+
+        response = decorated_app.test_client().post('/dropped')
+        assert response.status_code == 200
+        with decorated_app.app_context():
+            assert AuditLog.query.count() == 0
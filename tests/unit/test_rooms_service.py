@@ -0,0 +1,138 @@
+"""
+Unit tests for rooms service helpers.
+"""
+
+import orjson
+import pytest
+from types import SimpleNamespace
+from services.rooms import app as rooms_service
+
+
+def _room(room_id, **overrides):
+    """Build a stand-in Room with the attributes serialized by the service."""
+    values = {
+        'id': room_id,
+        'name': f'Room {room_id}',
+        'capacity': 10,
+        'floor': 1,
+        'building': 'Main',
+        'location': None,
+        'equipment': ['projector'],
+        'amenities': [],
+        'hourly_rate': None,
+        'image_url': None,
+        'status': 'available'
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _ndjson_records(rooms, include_status=True):
+    """Render rooms through _ndjson_response and parse every line."""
+    with rooms_service.app.test_request_context():
+        response = rooms_service._ndjson_response(rooms, include_status)
+        assert response.mimetype == 'application/x-ndjson'
+        body = response.get_data()
+
+    assert body.endswith(b'\n')
+    return [orjson.loads(line) for line in body.splitlines()]
+
+
+class TestNdjsonResponse:
+    """Test streamed room listings."""
+
+    def test_one_record_per_room(self):
+        """Test each line is a complete JSON room summary."""
+        records = _ndjson_records([_room(1), _room(2, equipment=['tv', 'whiteboard'])])
+
+        assert [record['id'] for record in records] == [1, 2]
+        assert records[1]['equipment'] == ['tv', 'whiteboard']
+        assert records[0]['status'] == 'available'
+
+    def test_status_omitted(self):
+        """Test include_status=False leaves status out."""
+        records = _ndjson_records([_room(1)], include_status=False)
+        assert 'status' not in records[0]
+
+    def test_error_mid_stream_ends_with_error_record(self):
+        """Test a failure after the first row ends the stream with an error record."""
+        def rooms():
+            yield _room(1)
+            raise RuntimeError('connection lost')
+
+        records = _ndjson_records(rooms())
+
+        assert records[0]['id'] == 1
+        assert records[-1] == {'success': False, 'error': 'Room listing interrupted'}
+        assert len(records) == 2
+
+
+# One value per SQL filter of get_all_rooms, as the view passes them
+_FILTER_VALUES = {
+    'capacity_min': 8,
+    'capacity_max': 20,
+    'location': 'Wing',
+    'building': 'main',
+    'floor': 2,
+    'status': 'available'
+}
+
+
+def _orm_query(values):
+    """Build the listing query with chained ORM filters, as get_all_rooms did before prebuilt statements."""
+    Room = rooms_service.Room
+    query = Room.query
+    if 'capacity_min' in values:
+        query = query.filter(Room.capacity >= values['capacity_min'])
+    if 'capacity_max' in values:
+        query = query.filter(Room.capacity <= values['capacity_max'])
+    if 'location' in values:
+        query = query.filter(Room.location.ilike(f"%{values['location']}%"))
+    if 'building' in values:
+        query = query.filter(Room.building.ilike(f"%{values['building']}%"))
+    if 'floor' in values:
+        query = query.filter(Room.floor == values['floor'])
+    if 'status' in values:
+        query = query.filter(Room.status == values['status'])
+    return query.order_by(Room.name)
+
+
+class TestRoomListStatements:
+    """Test the prebuilt get_all_rooms statements against chained ORM filters."""
+
+    @pytest.fixture
+    def rooms(self, db_session):
+        """Rooms spread across every filtered column."""
+        Room = rooms_service.Room
+        specs = [
+            ('Alpha', 6, 1, 'Main Building', 'East Wing', 'available'),
+            ('Bravo', 8, 2, 'Main Building', 'West Wing', 'available'),
+            ('Charlie', 12, 2, 'Annex', 'West Wing', 'maintenance'),
+            ('Delta', 20, 2, 'Main Building', 'Lobby', 'available'),
+            ('Echo', 25, 3, 'Annex', 'North Wing', 'booked'),
+            ('Foxtrot', 10, 2, 'MAIN Annex', None, 'available'),
+        ]
+        for name, capacity, floor, building, location, status in specs:
+            db_session.add(Room(name=name, capacity=capacity, floor=floor, building=building,
+                                location=location, status=status))
+        db_session.commit()
+        return specs
+
+    @pytest.mark.parametrize('mask', range(1 << len(_FILTER_VALUES)))
+    def test_matches_orm_query(self, db_session, rooms, mask):
+        """Test every combination of filters selects, pages and counts the same rows."""
+        values = {name: value for bit, (name, value) in enumerate(_FILTER_VALUES.items())
+                  if mask & (1 << bit)}
+        params = dict(values)
+        for name in ('location', 'building'):
+            if name in params:
+                params[name] = f'%{params[name]}%'
+
+        ordered_stmt, page_stmt, count_stmt = rooms_service._room_list_statements_for(params)
+        expected = [room.id for room in _orm_query(values).all()]
+
+        assert [room.id for room in db_session.execute(ordered_stmt, params).scalars()] == expected
+        assert db_session.execute(count_stmt, params).scalar() == len(expected)
+
+        page = db_session.execute(page_stmt, dict(params, limit=2, offset=1)).scalars()
+        assert [room.id for room in page] == expected[1:3]
@@ -0,0 +1,198 @@
+"""
+Unit tests for sanitization utilities.
+"""
+
+import re
+import bleach
+import pytest
+from utils import sanitizers
+from utils.sanitizers import (
+    ALLOWED_ATTRIBUTES,
+    ALLOWED_TAGS,
+    SQL_INJECTION_PATTERNS,
+    XSS_PATTERNS,
+    has_sql_injection_pattern,
+    has_xss_pattern,
+    sanitize_html,
+    sanitize_json_input
+)
+
+
+# The detectors as originally written: one case-insensitive re.search per pattern
+LEGACY_SQL_INJECTION_PATTERNS = [
+    r"(\bOR\b.*=.*)",
+    r"(\bAND\b.*=.*)",
+    r"(--|#|/\*|\*/)",
+    r"(\bUNION\b.*\bSELECT\b)",
+    r"(\bINSERT\b.*\bINTO\b)",
+    r"(\bUPDATE\b.*\bSET\b)",
+    r"(\bDELETE\b.*\bFROM\b)",
+    r"(\bDROP\b.*\bTABLE\b)",
+    r"(;.*\b(SELECT|INSERT|UPDATE|DELETE|DROP)\b)",
+    r"(\bEXEC\b|\bEXECUTE\b)",
+    r"('.*OR.*'.*=.*')",
+]
+LEGACY_XSS_PATTERNS = [
+    r"<script[^>]*>",
+    r"javascript:",
+    r"onerror\s*=",
+    r"onload\s*=",
+    r"onclick\s*=",
+    r"<iframe[^>]*>",
+    r"<object[^>]*>",
+    r"<embed[^>]*>",
+]
+
+
+def _legacy_match(patterns, text):
+    """Run the original per-pattern loop."""
+    return any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)
+
+
+SQL_INJECTION_CASES = [
+    ("admin' OR '1'='1", True),
+    ("1 or 1=1", True),
+    ("x AND y=2", True),
+    ("name -- comment", True),
+    ("#hashtag", True),
+    ("/* block */", True),
+    ("1 UNION ALL SELECT password", True),
+    ("insert into users", True),
+    ("Update users set role", True),
+    ("DELETE FROM rooms", True),
+    ("drop table bookings", True),
+    ("1; select 1", True),
+    ("EXEC xp_cmdshell", True),
+    ("execute immediate", True),
+    ("Conference Room A", False),
+    ("Board meeting on floor 3", False),
+    ("orange = fruit", False),
+    ("android=phone", False),
+    ("ORDER BY name", False),
+    ("selection of rooms; updated daily", False),
+    ("a-b", False),
+    ("", False),
+    ("line one\nOR x=1", True),
+    ("OR\nx=1", False),
+]
+
+XSS_CASES = [
+    ("<script>alert(1)</script>", True),
+    ("<SCRIPT src=x>", True),
+    ("<script", False),
+    ("javascript:alert(1)", True),
+    ("JavaScript:void(0)", True),
+    ("<img src=x onerror=alert(1)>", True),
+    ("onload =go()", True),
+    ("ONCLICK\t= steal()", True),
+    ("<iframe src=evil>", True),
+    ("<object data=x>", True),
+    ("<EMBED src=x>", True),
+    ("<p>Nice room</p>", False),
+    ("ratio a:b = 2", False),
+    ("time 10:30", False),
+    ("onclick handler", False),
+    ("plain text", False),
+    ("", False),
+]
+
+
+@pytest.fixture(params=['re', 're2'])
+def detector_engine(request, monkeypatch):
+    """Compile the detectors with each regex engine the module may pick."""
+    engine = re if request.param == 're' else pytest.importorskip('re2')
+    monkeypatch.setattr(sanitizers, '_SQL_INJECTION_RE',
+                        engine.compile('(?i)' + '|'.join(SQL_INJECTION_PATTERNS)))
+    monkeypatch.setattr(sanitizers, '_XSS_RE', engine.compile('(?i)' + '|'.join(XSS_PATTERNS)))
+    return request.param
+
+
+class TestDetectors:
+    """Pin the combined detectors to the original per-pattern loops."""
+
+    @pytest.mark.parametrize('text,expected', SQL_INJECTION_CASES)
+    def test_sql_injection(self, detector_engine, text, expected):
+        """Test SQL injection detection matches the per-pattern loop."""
+        assert _legacy_match(LEGACY_SQL_INJECTION_PATTERNS, text) is expected
+        assert has_sql_injection_pattern(text) is expected
+
+    @pytest.mark.parametrize('text,expected', XSS_CASES)
+    def test_xss(self, detector_engine, text, expected):
+        """Test XSS detection matches the per-pattern loop."""
+        assert _legacy_match(LEGACY_XSS_PATTERNS, text) is expected
+        assert has_xss_pattern(text) is expected
+
+
+class TestSanitizeHtml:
+    """Test the plain-text fast path of sanitize_html."""
+
+    @pytest.mark.parametrize('text', [
+        'Plain comment',
+        'Tabs\tand\nnewlines',
+        'a > b',
+        'Tom & Jerry',
+        '<b>bold</b> <strong>kept</strong>',
+        'carriage\rreturn',
+        'bell\x07char',
+    ])
+    def test_matches_bleach(self, text):
+        """Test the output equals a full bleach.clean()."""
+        assert sanitize_html(text) == bleach.clean(
+            text, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True
+        )
+
+
+class TestSanitizeJsonInput:
+    """Test copy-on-change JSON sanitization."""
+
+    def test_clean_input_returned_as_is(self):
+        """Test clean input comes back as the same objects."""
+        data = {'name': 'Room A', 'tags': ['quiet', {'floor': 2}], 'meta': {'seats': 10}}
+
+        result = sanitize_json_input(data)
+
+        assert result is data
+        assert result['tags'] is data['tags']
+        assert result['meta'] is data['meta']
+
+    def test_dirty_input_copied(self):
+        """Test a changed value produces new containers and leaves the input unchanged."""
+        data = {'name': '  Room A\x00 ', 'tags': ['quiet'], 'meta': {'note': 'ok'}}
+
+        result = sanitize_json_input(data)
+
+        assert result is not data
+        assert result == {'name': 'Room A', 'tags': ['quiet'], 'meta': {'note': 'ok'}}
+        assert data['name'] == '  Room A\x00 '
+        assert result['tags'] is data['tags']
+        assert result['meta'] is data['meta']
+
+    def test_nested_change_copies_path(self):
+        """Test only the containers on the path to a change are copied."""
+        inner = {'note': ' padded '}
+        items = ['clean', inner]
+        data = {'first': 'x', 'items': items, 'other': {'k': 'v'}}
+
+        result = sanitize_json_input(data)
+
+        assert result is not data
+        assert result['items'] is not items
+        assert result['items'][1] is not inner
+        assert result['items'] == ['clean', {'note': 'padded'}]
+        assert result['other'] is data['other']
+        assert list(result) == ['first', 'items', 'other']
+        assert inner == {'note': ' padded '}
+
+    def test_dirty_key(self):
+        """Test a key that needs sanitizing is replaced, keeping order."""
+        data = {'a': 1, ' b ': 2, 'c': 3}
+
+        result = sanitize_json_input(data)
+
+        assert result == {'a': 1, 'b': 2, 'c': 3}
+        assert list(result) == ['a', 'b', 'c']
+
+    def test_non_dict_passthrough(self):
+        """Test non-dict input is returned unchanged."""
+        items = [1, 2]
+        assert sanitize_json_input(items) is items
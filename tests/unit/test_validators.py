@@ -13,6 +13,7 @@ from utils.validators import (
     validate_room_capacity,
     validate_booking_times,
     validate_rating,
+    validate_ratings_bulk,
     ValidationError
 )
 
@@ -193,3 +194,37 @@ class TestRatingValidation:
         """Test non-integer rating."""
         with pytest.raises(ValidationError, match='between 1 and 5'):
             validate_rating(3.5)
+
+    def test_valid_ratings_bulk(self):
+        """Test a batch of valid ratings."""
+        validate_ratings_bulk([1, 2, 3, 4, 5])
+        validate_ratings_bulk([])
+
+    def test_invalid_ratings_bulk(self):
+        """Test a batch reports the first out-of-range index."""
+        with pytest.raises(ValidationError, match='index 2'):
+            validate_ratings_bulk([5, 4, 0, 6])
+
+    def test_invalid_ratings_bulk_type(self):
+        """Test a batch containing non-integers."""
+        with pytest.raises(ValidationError, match='between 1 and 5'):
+            validate_ratings_bulk([1, 3.5])
+
+    @pytest.mark.parametrize('rating', [
+        1, 5, 0, 6, -1, True, False, 3.0, 3.5, '3', None, [3], 10 ** 30
+    ])
+    def test_ratings_bulk_agrees_with_single(self, rating):
+        """Test a one-item batch passes exactly when validate_rating passes."""
+        try:
+            validate_rating(rating)
+            single_valid = True
+        except ValidationError:
+            single_valid = False
+
+        try:
+            validate_ratings_bulk([rating])
+            bulk_valid = True
+        except ValidationError:
+            bulk_valid = False
+
+        assert bulk_valid is single_valid
@@ -1,37 +1,105 @@
-"""Utilities package initialization."""
-
-from utils.auth import (
-    hash_password,
-    verify_password,
-    generate_tokens,
-    jwt_required_custom,
-    get_current_user,
-    role_required,
-    admin_required,
-    moderator_required,
-    facility_manager_required
-)
-from utils.validators import ValidationError
-from utils.sanitizers import (
-    sanitize_html,
-    sanitize_string,
-    sanitize_username,
-    sanitize_email,
-    sanitize_comment,
-    has_sql_injection_pattern,
-    has_xss_pattern
-)
-from utils.logger import setup_logger, app_logger
-from utils.exceptions import *
-from utils.responses import *
-from utils.decorators import *
-from utils.circuit_breaker import CircuitBreaker, get_circuit_breaker, with_circuit_breaker
-from utils.cache import cache, cached, invalidate_cache
-from utils.http_client import ServiceClient, ServiceClients
+"""Utilities package initialization.
+
+Names are loaded on first access (PEP 562), so importing one utility module
+does not pull in Redis, the HTTP client or the password hashers.
+"""
+
+import importlib
+
+_LAZY = {
+    **dict.fromkeys((
+        'hash_password',
+        'verify_password',
+        'hash_password_async',
+        'verify_password_async',
+        'password_needs_rehash',
+        'generate_tokens',
+        'jwt_required_custom',
+        'get_current_user',
+        'role_required',
+        'admin_required',
+        'moderator_required',
+        'facility_manager_required',
+    ), 'utils.auth'),
+    **dict.fromkeys((
+        'sanitize_html',
+        'sanitize_string',
+        'sanitize_username',
+        'sanitize_email',
+        'sanitize_comment',
+        'has_sql_injection_pattern',
+        'has_xss_pattern',
+    ), 'utils.sanitizers'),
+    **dict.fromkeys(('setup_logger', 'app_logger'), 'utils.logger'),
+    **dict.fromkeys((
+        'SMRException',
+        'ValidationError',
+        'AuthenticationError',
+        'AuthorizationError',
+        'NotFoundError',
+        'ConflictError',
+        'RateLimitError',
+        'ServiceUnavailableError',
+        'DatabaseError',
+        'ExternalServiceError',
+        'BookingConflictError',
+        'AccountLockedError',
+        'CircuitBreakerOpenError',
+    ), 'utils.exceptions'),
+    **dict.fromkeys((
+        'OrjsonProvider',
+        'success_response',
+        'error_response',
+        'created_response',
+        'no_content_response',
+        'paginated_response',
+        'validation_error_response',
+        'unauthorized_response',
+        'forbidden_response',
+        'not_found_response',
+        'conflict_response',
+        'rate_limit_response',
+        'server_error_response',
+        'service_unavailable_response',
+    ), 'utils.responses'),
+    **dict.fromkeys((
+        'audit_log',
+        'measure_time',
+        'handle_errors',
+        'validate_json',
+        'TokenBucketRateLimiter',
+        'rate_limiter',
+        'rate_limit',
+        'cache_response',
+        'require_service_account',
+    ), 'utils.decorators'),
+    **dict.fromkeys(('CircuitBreaker', 'get_circuit_breaker', 'with_circuit_breaker'), 'utils.circuit_breaker'),
+    **dict.fromkeys(('cache', 'cached', 'invalidate_cache'), 'utils.cache'),
+    **dict.fromkeys(('ServiceClient', 'ServiceClients'), 'utils.http_client'),
+}
+
+
+def __getattr__(name):
+    """Import the module providing name on first access and keep the result."""
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     'hash_password',
     'verify_password',
+    'hash_password_async',
+    'verify_password_async',
+    'password_needs_rehash',
     'generate_tokens',
     'jwt_required_custom',
     'get_current_user',
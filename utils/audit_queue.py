@@ -0,0 +1,241 @@
+"""
+Batched audit log writes.
+
+Audited requests hand their AuditLog rows to an in-process queue; a single
+writer thread per process inserts them in batches, so requests no longer pay
+for a separate audit COMMIT.
+"""
+
+import atexit
+import io
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+from flask import Flask
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from database.models import db, AuditLog
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# Columns filled by audit_log rows, in COPY order
+AUDIT_COPY_COLUMNS = (
+    'user_id', 'service', 'action', 'resource_type', 'ip_address', 'user_agent',
+    'success', 'error_message', 'created_at', 'updated_at'
+)
+
+# Batches at least this large go through COPY on PostgreSQL; smaller ones use INSERT
+AUDIT_COPY_MIN_ROWS = 20
+
+# Queued by stop() to make the writer thread exit
+_STOP = object()
+
+_AUDIT_COPY_SQL = (
+    f"COPY {AuditLog.__tablename__} ({', '.join(AUDIT_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+)
+
+
+def _copy_field(value: Any) -> str:
+    """Encode one value as a CSV field; NULL is the only unquoted (empty) field."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_audit_rows(session: Session, rows: List[Dict]) -> None:
+    """Stream rows into audit_logs with COPY on the session's connection."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_copy_field(row.get(column)) for column in AUDIT_COPY_COLUMNS))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    dbapi_connection = session.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(_AUDIT_COPY_SQL, buffer)
+
+
+def write_audit_rows(rows: List[Dict]) -> None:
+    """
+    Insert audit rows with one executemany and commit.
+
+    Rows are written in their own session and transaction, never through
+    db.session, so the caller's pending changes are neither committed nor
+    rolled back. On PostgreSQL the commit does not wait for the WAL flush;
+    audit rows are not worth an fsync each. Large batches on psycopg2 are
+    loaded with COPY, which skips per-row statement parsing. Must run inside
+    an application context.
+
+    Args:
+        rows: AuditLog column values, one dict per row
+    """
+    if not rows:
+        return
+
+    dialect = db.engine.dialect
+    with Session(db.engine) as session, session.begin():
+        if dialect.name == 'postgresql':
+            session.execute(text('SET LOCAL synchronous_commit = OFF'))
+
+        if (dialect.name == 'postgresql' and dialect.driver == 'psycopg2'
+                and len(rows) >= AUDIT_COPY_MIN_ROWS):
+            _copy_audit_rows(session, rows)
+        else:
+            session.execute(insert(AuditLog), rows)
+
+
+class AuditLogQueue:
+    """
+    Queue of pending audit rows drained by a background writer thread.
+
+    The writer starts on the first put() so it runs in the worker process that
+    serves requests, never in a pre-fork parent. A batch is written once it
+    reaches batch_size rows or flush_interval seconds after its first row.
+    At interpreter exit stop() ends the writer before the remaining rows are
+    written, so no row is written twice or by two threads at once.
+    """
+
+    def __init__(self):
+        """Create an idle queue; start() configures it from the Flask app."""
+        self.queue = None
+        self.app = None
+        self.batch_size = 100
+        self.flush_interval = 1.0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self, app: Flask) -> None:
+        """Create the queue and writer thread for app."""
+        self.app = app
+        self.batch_size = app.config.get('AUDIT_BATCH_SIZE', 100)
+        self.flush_interval = app.config.get('AUDIT_FLUSH_INTERVAL', 1.0)
+        self.queue = queue.Queue(maxsize=app.config.get('AUDIT_QUEUE_SIZE', 10_000))
+
+        self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def put(self, app: Flask, row: Dict) -> bool:
+        """
+        Enqueue one audit row.
+
+        Args:
+            app: Application whose database receives the row
+            row: AuditLog column values
+
+        Returns:
+            False if the queue is full and the caller must write the row itself
+        """
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._start(app)
+
+        try:
+            self.queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return False
+
+    def _next_batch(self) -> tuple:
+        """
+        Block for the first row, then collect more until the batch is full or due.
+
+        Returns:
+            Tuple of (rows, stopping); stopping is True once the stop sentinel was taken
+        """
+        first = self.queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                row = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+
+        return batch, False
+
+    def _write(self, rows: List[Dict]) -> None:
+        """Insert rows; failures are logged, not raised."""
+        with self.app.app_context():
+            try:
+                write_audit_rows(rows)
+            except Exception as e:
+                logger.error("Failed to write %s audit log rows: %s", len(rows), e)
+
+    def _run(self) -> None:
+        """Writer thread loop; returns after writing the batch that held the stop sentinel."""
+        while True:
+            rows, stopping = self._next_batch()
+            if rows:
+                self._write(rows)
+            if stopping:
+                return
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the writer thread, then write every row still queued.
+
+        Registered to run at interpreter exit. The sentinel is queued behind
+        any pending rows, so the writer finishes its current batch and exits
+        before flush() drains what is left.
+
+        Args:
+            timeout: Seconds to wait for the writer thread to finish
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            self.flush()
+            return
+
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("Audit queue full at shutdown; writer thread not stopped")
+            return
+
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.error("Audit writer did not stop within %s seconds", timeout)
+            return
+
+        self.flush()
+
+    def flush(self) -> None:
+        """Write every row still queued; only safe once the writer thread has stopped."""
+        if self.queue is None:
+            return
+
+        rows = []
+        while True:
+            try:
+                row = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                rows.append(row)
+
+        for start in range(0, len(rows), self.batch_size):
+            self._write(rows[start:start + self.batch_size])
+
+
+# Global audit queue instance
+audit_queue = AuditLogQueue()
@@ -3,8 +3,17 @@ Authentication utilities for JWT token management and password hashing.
 """
 
 import bcrypt
+import hashlib
+import hmac
+import multiprocessing
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from functools import wraps
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
+from cachetools import TTLCache
 from flask import request, jsonify
 from flask_jwt_extended import (
     create_access_token,
@@ -13,12 +22,33 @@ from flask_jwt_extended import (
     verify_jwt_in_request,
     get_jwt
 )
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from configs.config import Config
 
+# Worker processes for password hashing, created on first use; see _get_hash_pool()
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+# argon2id spreads one hash over several cores; bcrypt hashes are still verified for existing users
+_password_hasher = PasswordHasher(
+    time_cost=Config.ARGON2_TIME_COST,
+    memory_cost=Config.ARGON2_MEMORY_COST,
+    parallelism=Config.ARGON2_PARALLELISM
+)
+BCRYPT_HASH_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+# Recent verification results, so repeated logins skip the slow hash. Keys are
+# HMACs under a per-process secret, so plaintext passwords are never stored, and
+# include the stored hash, so a password change never matches an old entry.
+_verify_cache = TTLCache(maxsize=Config.PASSWORD_VERIFY_CACHE_SIZE, ttl=Config.PASSWORD_VERIFY_CACHE_TTL)
+_verify_cache_lock = threading.Lock()
+_verify_cache_secret = secrets.token_bytes(32)
+
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using argon2id.
 
     Args:
         password: Plain text password
@@ -26,14 +56,121 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    salt = bcrypt.gensalt(rounds=Config.BCRYPT_LOG_ROUNDS)
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    return _password_hasher.hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
     """
     Verify a password against its hash.
 
+    Both argon2id hashes and legacy bcrypt hashes are accepted.
+
+    Args:
+        password: Plain text password
+        password_hash: Hashed password
+
+    Returns:
+        Boolean indicating if password matches
+    """
+    if password_hash.startswith(BCRYPT_HASH_PREFIXES):
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except (VerifyMismatchError, VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """
+    Check whether a stored hash should be replaced after a successful login.
+
+    Args:
+        password_hash: Hashed password
+
+    Returns:
+        True for legacy bcrypt hashes and argon2 hashes with outdated parameters
+    """
+    if password_hash.startswith(BCRYPT_HASH_PREFIXES):
+        return True
+
+    try:
+        return _password_hasher.check_needs_rehash(password_hash)
+    except InvalidHashError:
+        return True
+
+
+def _get_hash_pool():
+    """
+    Return the shared password hashing process pool, creating it on first use.
+
+    Workers are forked and only ever hash passwords, so they never touch the
+    database connections inherited from the parent process.
+
+    Returns:
+        ProcessPoolExecutor, or None when PASSWORD_HASH_POOL_WORKERS is 0
+    """
+    global _hash_pool
+
+    if Config.PASSWORD_HASH_POOL_WORKERS <= 0:
+        return None
+
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=Config.PASSWORD_HASH_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context('fork')
+                )
+
+    return _hash_pool
+
+
+def warm_hash_pool() -> None:
+    """
+    Start the password hashing worker processes ahead of the first request.
+
+    Meant for a server's post-fork hook, so the pool is forked before any
+    request threads exist rather than from a multi-threaded worker.
+    """
+    pool = _get_hash_pool()
+    if pool is not None:
+        pool.submit(bcrypt.gensalt, rounds=4).result()
+
+
+def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the shared process pool.
+
+    The calling thread waits for the result, but the CPU-bound work runs
+    outside the worker so other request threads are not starved of the GIL.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password string
+    """
+    pool = _get_hash_pool()
+    if pool is None:
+        return hash_password(password)
+
+    return pool.submit(hash_password, password).result()
+
+
+def _verify_cache_key(password: str, password_hash: str) -> bytes:
+    """Build the verification cache key for a password and stored hash."""
+    password_mac = hmac.new(_verify_cache_secret, password.encode('utf-8'), hashlib.sha256).digest()
+    return password_mac + password_hash.encode('utf-8')
+
+
+def verify_password_async(password: str, password_hash: str) -> bool:
+    """
+    Verify a password against its hash in the shared process pool.
+
+    Results are remembered for PASSWORD_VERIFY_CACHE_TTL seconds, so only
+    the first attempt with a given password pays for the hash.
+
     Args:
         password: Plain text password
         password_hash: Hashed password
@@ -41,7 +178,22 @@ def verify_password(password: str, password_hash: str) -> bool:
     Returns:
         Boolean indicating if password matches
     """
-    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    cache_key = _verify_cache_key(password, password_hash)
+    with _verify_cache_lock:
+        result = _verify_cache.get(cache_key)
+    if result is not None:
+        return result
+
+    pool = _get_hash_pool()
+    if pool is None:
+        result = verify_password(password, password_hash)
+    else:
+        result = pool.submit(verify_password, password, password_hash).result()
+
+    with _verify_cache_lock:
+        _verify_cache[cache_key] = result
+
+    return result
 
 
 def generate_tokens(user_id: int, username: str, role: str):
@@ -80,6 +232,33 @@ def generate_tokens(user_id: int, username: str, role: str):
     }
 
 
+def _claims() -> dict:
+    """
+    Return the current request's JWT claims, verifying the token at most once.
+
+    flask_jwt_extended keeps the decoded token on flask.g after verification,
+    so routes already behind @jwt_required() reuse it instead of decoding and
+    checking the signature again.
+
+    Returns:
+        Dictionary of JWT claims
+
+    Raises:
+        Exception: If the request carries no valid token
+    """
+    try:
+        claims = get_jwt()
+    except RuntimeError:
+        claims = None
+
+    # Empty claims mean an optional route saw no token; verify to raise the usual error
+    if not claims:
+        verify_jwt_in_request()
+        claims = get_jwt()
+
+    return claims
+
+
 def jwt_required_custom(fn):
     """
     Decorator to require JWT authentication for route.
@@ -90,7 +269,7 @@ def jwt_required_custom(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         try:
-            verify_jwt_in_request()
+            _claims()
             return fn(*args, **kwargs)
         except Exception as e:
             return jsonify({'error': 'Authentication required', 'message': str(e)}), 401
@@ -102,20 +281,25 @@ def get_current_user():
     """
     Get current user information from JWT token.
 
+    Anonymous requests return None without touching the JWT machinery.
+
     Returns:
-        Dictionary with user_id, username, and role
+        Dictionary with user_id, username, and role, or None without a valid token
     """
+    if not request.headers.get('Authorization', '').startswith('Bearer '):
+        return None
+
     try:
-        verify_jwt_in_request()
-        claims = get_jwt()
-        return {
-            'user_id': claims.get('user_id'),
-            'username': claims.get('username'),
-            'role': claims.get('role')
-        }
-    except:
+        claims = _claims()
+    except (JWTExtendedException, PyJWTError):
         return None
 
+    return {
+        'user_id': claims.get('user_id'),
+        'username': claims.get('username'),
+        'role': claims.get('role')
+    }
+
 
 def role_required(*roles):
     """
@@ -127,18 +311,19 @@ def role_required(*roles):
     Returns:
         Decorated function
     """
+    roles_set = frozenset(roles)
+    forbidden_message = f'Required role: {", ".join(roles)}'
+
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             try:
-                verify_jwt_in_request()
-                claims = get_jwt()
-                user_role = claims.get('role')
+                user_role = _claims().get('role')
 
-                if user_role not in roles:
+                if user_role not in roles_set:
                     return jsonify({
                         'error': 'Forbidden',
-                        'message': f'Required role: {", ".join(roles)}'
+                        'message': forbidden_message
                     }), 403
 
                 return fn(*args, **kwargs)
@@ -3,46 +3,150 @@ Redis caching utilities for performance optimization.
 Part II Enhancement: Performance Optimization - Caching Mechanism
 """
 
-import json
+import fnmatch
+import hashlib
+import inspect
+import orjson
+import pickle
 import redis
+import socket
+import threading
+from cachetools import TTLCache
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, List, Optional
+from flask import current_app, g, has_request_context, request, Response
+from flask_jwt_extended import get_jwt
 from configs.config import Config
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Cache entries are orjson bytes; dates and datetimes encode natively as ISO 8601
+CACHE_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# delete_pattern() scans this many keys per SCAN call and sends UNLINKs in batches
+DELETE_SCAN_COUNT = 500
+DELETE_BATCH_SIZE = 1000
+
+
+def _keepalive_options() -> dict:
+    """TCP keepalive tuning for Redis connections, limited to what the platform supports."""
+    options = {
+        'TCP_KEEPIDLE': 30,
+        'TCP_KEEPINTVL': 10,
+        'TCP_KEEPCNT': 3,
+    }
+    return {getattr(socket, name): value for name, value in options.items() if hasattr(socket, name)}
+
+
+def _request_local() -> Optional[dict]:
+    """Return the current request's prefetched cache entries, if any."""
+    if not has_request_context():
+        return None
+    return g.get('_cache_local')
+
 
 class RedisCache:
     """
     Redis cache manager for application-wide caching.
 
     Provides methods for caching frequently accessed data to improve performance.
+    Recent hits are also kept, still encoded, in a small per-process L1 for
+    CACHE_L1_TTL seconds and decoded on every read. Writes and invalidations
+    made by other workers or services can't reach this L1, so they can take
+    up to CACHE_L1_TTL seconds to be seen here.
     """
 
     def __init__(self):
+        """Set up the cache; Redis is connected on first use, not at import."""
+        self.l1 = TTLCache(maxsize=Config.CACHE_L1_SIZE, ttl=Config.CACHE_L1_TTL)
+        self.l1_lock = threading.Lock()
+        self.l1_hits = 0
+        self.l1_misses = 0
+
+        self._redis_client = None
+        self._enabled = None
+        self._connect_lock = threading.Lock()
+
+    def _connect(self):
         """Initialize Redis connection."""
         try:
-            self.redis_client = redis.Redis(
+            # Threads share a bounded pool of long-lived connections and wait for a free
+            # one instead of opening more; redis-py parses with hiredis when installed
+            pool = redis.BlockingConnectionPool(
                 host=Config.REDIS_HOST,
                 port=Config.REDIS_PORT,
                 db=Config.REDIS_DB,
-                decode_responses=True,
+                max_connections=Config.REDIS_MAX_CONNECTIONS,
+                timeout=5,
+                decode_responses=False,
                 socket_connect_timeout=5,
-                socket_timeout=5
+                socket_timeout=5,
+                socket_keepalive=True,
+                socket_keepalive_options=_keepalive_options()
             )
+            self._redis_client = redis.Redis(connection_pool=pool)
             # Test connection
-            self.redis_client.ping()
-            self.enabled = True
+            self._redis_client.ping()
+            self._enabled = True
             logger.info("Redis cache initialized successfully")
         except redis.ConnectionError:
             logger.warning("Redis connection failed. Caching disabled.")
-            self.redis_client = None
-            self.enabled = False
+            self._redis_client = None
+            self._enabled = False
         except Exception as e:
             logger.error(f"Redis initialization error: {str(e)}")
-            self.redis_client = None
-            self.enabled = False
+            self._redis_client = None
+            self._enabled = False
+
+    def _ensure_connected(self):
+        """Connect on first use; later calls return immediately."""
+        if self._enabled is None:
+            with self._connect_lock:
+                if self._enabled is None:
+                    self._connect()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether Redis is reachable; the first access connects."""
+        self._ensure_connected()
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self._enabled = value
+
+    @property
+    def redis_client(self) -> Optional[redis.Redis]:
+        """Redis client, or None when caching is disabled."""
+        self._ensure_connected()
+        return self._redis_client
+
+    @redis_client.setter
+    def redis_client(self, value: Optional[redis.Redis]):
+        self._redis_client = value
+
+    def _l1_get(self, key: str) -> Optional[bytes]:
+        """Return the encoded value held in the L1, or None if absent or expired."""
+        with self.l1_lock:
+            raw = self.l1.get(key)
+            if raw is None:
+                self.l1_misses += 1
+            else:
+                self.l1_hits += 1
+        return raw
+
+    def _l1_put(self, key: str, raw: Optional[bytes]) -> None:
+        """Remember an encoded Redis hit in the L1."""
+        if raw:
+            with self.l1_lock:
+                self.l1[key] = raw
+
+    def _l1_discard(self, pattern: str) -> None:
+        """Drop L1 entries matching a key or glob pattern."""
+        with self.l1_lock:
+            for key in [key for key in self.l1 if fnmatch.fnmatchcase(key, pattern)]:
+                self.l1.pop(key, None)
 
     def get(self, key: str) -> Optional[Any]:
         """
@@ -57,19 +161,76 @@ class RedisCache:
         if not self.enabled:
             return None
 
+        local = _request_local()
+        if local is not None and key in local:
+            return local[key]
+
         try:
-            value = self.redis_client.get(key)
-            if value:
-                logger.debug(f"Cache hit for key: {key}")
-                return json.loads(value)
+            raw = self._l1_get(key)
+            if raw is None:
+                raw = self.redis_client.get(key)
+                if not raw:
+                    logger.debug("Cache miss for key: %s", key)
+                    return None
 
-            logger.debug(f"Cache miss for key: {key}")
-            return None
+                logger.debug("Cache hit for key: %s", key)
+                self._l1_put(key, raw)
+
+            # Decoded per hit so callers never share (and mutate) one cached object
+            return orjson.loads(raw)
 
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {str(e)}")
             return None
 
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several values from cache in one round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached values in key order, None for keys not found
+        """
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        raws = [self._l1_get(key) for key in keys]
+        missing = [i for i, raw in enumerate(raws) if raw is None]
+
+        try:
+            if missing:
+                values = self.redis_client.mget([keys[i] for i in missing])
+                for i, raw in zip(missing, values):
+                    raws[i] = raw
+                    self._l1_put(keys[i], raw)
+
+            return [orjson.loads(raw) if raw else None for raw in raws]
+
+        except Exception as e:
+            logger.error("Cache mget error for %s keys: %s", len(keys), e)
+            return [None] * len(keys)
+
+    def prefetch(self, keys: List[str]) -> None:
+        """
+        Load several keys with one MGET for the rest of the current request.
+
+        Later get() calls for these keys in the same request are answered
+        locally, hits and misses alike, instead of each costing a round-trip.
+        Outside a request this does nothing.
+
+        Args:
+            keys: Cache keys the request is about to read
+        """
+        if not self.enabled or not has_request_context():
+            return
+
+        local = g.setdefault('_cache_local', {})
+        missing = [key for key in keys if key not in local]
+        if missing:
+            local.update(zip(missing, self.mget(missing)))
+
     def set(self, key: str, value: Any, ttl: int = None) -> bool:
         """
         Set value in cache.
@@ -89,10 +250,17 @@ class RedisCache:
             if ttl is None:
                 ttl = Config.CACHE_TTL
 
-            serialized = json.dumps(value)
+            serialized = orjson.dumps(value, option=CACHE_JSON_OPTIONS)
             self.redis_client.setex(key, ttl, serialized)
+            with self.l1_lock:
+                self.l1.pop(key, None)
+
+            # Later reads in this request see the value as a Redis round-trip would return it
+            local = _request_local()
+            if local is not None:
+                local[key] = orjson.loads(serialized)
 
-            logger.debug(f"Cache set for key: {key} (TTL: {ttl}s)")
+            logger.debug("Cache set for key: %s (TTL: %ss)", key, ttl)
             return True
 
         except Exception as e:
@@ -112,9 +280,16 @@ class RedisCache:
         if not self.enabled:
             return False
 
+        local = _request_local()
+        if local is not None:
+            local[key] = None
+
+        with self.l1_lock:
+            self.l1.pop(key, None)
+
         try:
             self.redis_client.delete(key)
-            logger.debug(f"Cache deleted for key: {key}")
+            logger.debug("Cache deleted for key: %s", key)
             return True
 
         except Exception as e:
@@ -134,13 +309,26 @@ class RedisCache:
         if not self.enabled:
             return 0
 
+        if has_request_context():
+            g.pop('_cache_local', None)
+
+        self._l1_discard(pattern)
+
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                deleted = self.redis_client.delete(*keys)
-                logger.debug(f"Cache deleted {deleted} keys matching pattern: {pattern}")
-                return deleted
-            return 0
+            # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS;
+            # UNLINK frees the values in a background thread
+            deleted = 0
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in self.redis_client.scan_iter(match=pattern, count=DELETE_SCAN_COUNT):
+                pipe.unlink(key)
+                deleted += 1
+                if deleted % DELETE_BATCH_SIZE == 0:
+                    pipe.execute()
+            pipe.execute()
+
+            if deleted:
+                logger.debug("Cache deleted %s keys matching pattern: %s", deleted, pattern)
+            return deleted
 
         except Exception as e:
             logger.error(f"Cache delete pattern error for {pattern}: {str(e)}")
@@ -156,8 +344,11 @@ class RedisCache:
         if not self.enabled:
             return False
 
+        with self.l1_lock:
+            self.l1.clear()
+
         try:
-            self.redis_client.flushdb()
+            self.redis_client.flushdb(asynchronous=True)
             logger.info("Cache cleared")
             return True
 
@@ -228,41 +419,177 @@ class RedisCache:
 cache = RedisCache()
 
 
-def cached(key_prefix: str, ttl: int = None, key_builder: Callable = None):
+def _query_args_digest() -> str:
+    """
+    Build a compact digest of the current request's query parameters.
+
+    Parameters are hashed in sorted order so the digest does not depend on
+    their order in the URL.
+
+    Returns:
+        32-character hex digest, or empty string when there are no parameters
+    """
+    args = request.args
+    if not args:
+        return ''
+
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(args):
+        digest.update(name.encode())
+        digest.update(b'=')
+        digest.update('\x1f'.join(args.getlist(name)).encode())
+        digest.update(b'&')
+
+    return digest.hexdigest()
+
+
+def _to_cacheable(result: Any) -> Optional[Any]:
+    """
+    Convert a function or view result into a JSON-serializable cache entry.
+
+    View results of the form (Response, status) are stored as their JSON body
+    and status code; only successful JSON responses are cached.
+
+    Args:
+        result: Value returned by the decorated function
+
+    Returns:
+        Cacheable value, or None if the result should not be cached
+    """
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], Response):
+        response, status = result
+        if not 200 <= status < 300 or not response.is_json:
+            return None
+        return {'__response__': response.get_data(as_text=True), 'status': status}
+
+    if isinstance(result, Response):
+        return None
+
+    return result
+
+
+def _from_cacheable(value: Any) -> Any:
+    """
+    Rebuild a function or view result from a cache entry.
+
+    Args:
+        value: Value previously produced by _to_cacheable
+
+    Returns:
+        Original result, with cached responses rebuilt as (Response, status)
+    """
+    if isinstance(value, dict) and '__response__' in value:
+        response = current_app.response_class(value['__response__'], mimetype='application/json')
+        return response, value['status']
+
+    return value
+
+
+def _compile_args_key(func: Callable) -> Optional[Callable]:
+    """
+    Generate a function that binds func's arguments to a tuple in parameter order.
+
+    The generated function has func's own signature, so positional and keyword
+    spellings of the same call bind to the same tuple without a sorted() pass
+    per call.
+
+    Args:
+        func: Function being cached
+
+    Returns:
+        Argument binder, or None when func takes *args or **kwargs
+    """
+    namespace = {}
+    params = []
+    names = []
+
+    for index, param in enumerate(inspect.signature(func).parameters.values()):
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            return None
+
+        # '/' closes the positional-only parameters and must precede the '*' marker
+        if param.kind is not param.POSITIONAL_ONLY and names and names[-1][1] is param.POSITIONAL_ONLY:
+            params.append('/')
+        if param.kind is param.KEYWORD_ONLY and '*' not in params:
+            params.append('*')
+
+        if param.default is param.empty:
+            params.append(param.name)
+        else:
+            namespace[f'_default{index}'] = param.default
+            params.append(f'{param.name}=_default{index}')
+        names.append((param.name, param.kind))
+
+    if names and names[-1][1] is inspect.Parameter.POSITIONAL_ONLY:
+        params.append('/')
+
+    body = ''.join(f'{name}, ' for name, _ in names)
+    source = f"def _args_key({', '.join(params)}):\n    return ({body})\n"
+    exec(compile(source, f'<cached-key {func.__qualname__}>', 'exec'), namespace)
+    return namespace['_args_key']
+
+
+def cached(key_prefix: str, ttl: int = None, key_builder: Callable = None, vary_on_user: bool = False):
     """
     Decorator to cache function results.
 
+    Inside a request, the query parameters are part of the key. Requests
+    carrying an Authorization header bypass the cache unless vary_on_user is
+    set, in which case the JWT user id is appended to the key so one user's
+    response is never served to another.
+
     Args:
         key_prefix: Prefix for cache key
         ttl: Time to live in seconds
         key_builder: Optional function to build cache key from args
+        vary_on_user: Cache authenticated requests per JWT user
 
     Returns:
         Decorated function
     """
     def decorator(func: Callable) -> Callable:
+        default_key_prefix = f"{key_prefix}:{func.__name__}:"
+        args_key = None if key_builder else _compile_args_key(func)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            in_request = has_request_context()
+            authenticated = in_request and 'Authorization' in request.headers
+            if authenticated and not vary_on_user:
+                return func(*args, **kwargs)
+
             # Build cache key
             if key_builder:
                 cache_key = f"{key_prefix}:{key_builder(*args, **kwargs)}"
             else:
-                # Default: use function name and arguments
-                args_key = ':'.join(str(arg) for arg in args)
-                kwargs_key = ':'.join(f"{k}={v}" for k, v in sorted(kwargs.items()))
-                cache_key = f"{key_prefix}:{func.__name__}:{args_key}:{kwargs_key}"
+                # Default: function name plus a fixed-size digest of the arguments
+                if args_key is not None:
+                    raw = pickle.dumps(args_key(*args, **kwargs), protocol=5)
+                else:
+                    raw = pickle.dumps((args, tuple(sorted(kwargs.items()))), protocol=5)
+                cache_key = default_key_prefix + hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+            if in_request:
+                query_key = _query_args_digest()
+                if query_key:
+                    cache_key = f"{cache_key}:{query_key}"
+
+            if authenticated:
+                cache_key = f"{cache_key}:u{get_jwt().get('user_id')}"
 
             # Try to get from cache
             cached_result = cache.get(cache_key)
             if cached_result is not None:
-                logger.debug(f"Returning cached result for {func.__name__}")
-                return cached_result
+                logger.debug("Returning cached result for %s", func.__name__)
+                return _from_cacheable(cached_result)
 
             # Execute function
             result = func(*args, **kwargs)
 
             # Cache result
-            cache.set(cache_key, result, ttl)
+            cacheable = _to_cacheable(result)
+            if cacheable is not None:
+                cache.set(cache_key, cacheable, ttl)
 
             return result
 
@@ -279,11 +606,14 @@ def invalidate_cache(key_prefix: str):
     """
     Invalidate all cache entries with given prefix.
 
+    Both the key equal to the prefix and every key nested under it are removed.
+
     Args:
         key_prefix: Cache key prefix to invalidate
     """
+    cache.delete(key_prefix)
     cache.delete_pattern(f"{key_prefix}:*")
-    logger.info(f"Invalidated cache for prefix: {key_prefix}")
+    logger.info("Invalidated cache for prefix: %s", key_prefix)
 
 
 def get_cache_stats() -> dict:
@@ -309,7 +639,10 @@ def get_cache_stats() -> dict:
             'hit_rate': (
                 info.get('keyspace_hits', 0) /
                 (info.get('keyspace_hits', 0) + info.get('keyspace_misses', 1))
-            ) * 100
+            ) * 100,
+            'l1_size': len(cache.l1),
+            'l1_hits': cache.l1_hits,
+            'l1_misses': cache.l1_misses
         }
     except Exception as e:
         logger.error(f"Error getting cache stats: {str(e)}")
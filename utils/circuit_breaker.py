@@ -3,6 +3,8 @@ Circuit Breaker Pattern implementation for fault-tolerant inter-service communic
 Part II Enhancement: Enhanced Inter-Service Communication
 """
 
+import logging
+import threading
 import time
 from enum import Enum
 from functools import wraps
@@ -30,6 +32,10 @@ class CircuitBreaker:
     - Allowing periodic retry attempts
     - Closing circuit when service recovers
 
+    While the circuit is CLOSED with no recorded failures, call() is bound to a
+    fast path that only watches for the first failure; successes on that path
+    are not added to success_count.
+
     Attributes:
         failure_threshold: Number of failures before opening circuit
         recovery_timeout: Seconds to wait before attempting recovery
@@ -55,23 +61,42 @@ class CircuitBreaker:
         self.service_name = service_name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self.recovery_timeout_ns = int(recovery_timeout * 1_000_000_000)
         self.expected_exception = expected_exception
 
         self.failure_count = 0
         self.success_count = 0
-        self.last_failure_time = None
+        self.last_failure_time = None  # wall clock, for reporting only
+        self.last_failure_ns = None  # monotonic, immune to clock adjustments
         self.state = CircuitState.CLOSED
+        self._lock = threading.Lock()
+        self.call = self._fast_call
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Circuit breaker initialized for %s", service_name,
+                extra={
+                    'service': service_name,
+                    'failure_threshold': failure_threshold,
+                    'recovery_timeout': recovery_timeout
+                }
+            )
 
-        logger.info(
-            f"Circuit breaker initialized for {service_name}",
-            extra={
-                'service': service_name,
-                'failure_threshold': failure_threshold,
-                'recovery_timeout': recovery_timeout
-            }
-        )
+    def _fast_call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Execute function while the circuit is healthy.
 
-    def call(self, func: Callable, *args, **kwargs) -> Any:
+        Skips the state checks; the first failure switches call() back to
+        _full_call until the failure count is cleared again.
+        """
+        try:
+            return func(*args, **kwargs)
+        except self.expected_exception as e:
+            self.call = self._full_call
+            self._record_failure(e)
+            raise
+
+    def _full_call(self, func: Callable, *args, **kwargs) -> Any:
         """
         Execute function with circuit breaker protection.
 
@@ -87,20 +112,23 @@ class CircuitBreaker:
             CircuitBreakerOpenError: If circuit is open
             Exception: Original exception if function fails
         """
-        # Check if circuit is open
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self._transition_to_half_open()
-            else:
-                logger.warning(
-                    f"Circuit breaker is OPEN for {self.service_name}",
-                    extra={
-                        'service': self.service_name,
-                        'state': self.state.value,
-                        'failure_count': self.failure_count
-                    }
-                )
-                raise CircuitBreakerOpenError(self.service_name)
+        # Check if circuit is open; the common CLOSED case needs no lock
+        if self.state is CircuitState.OPEN:
+            with self._lock:
+                if self.state is CircuitState.OPEN:
+                    if self._should_attempt_reset():
+                        self._transition_to_half_open()
+                    else:
+                        if logger.isEnabledFor(logging.WARNING):
+                            logger.warning(
+                                "Circuit breaker is OPEN for %s", self.service_name,
+                                extra={
+                                    'service': self.service_name,
+                                    'state': self.state.value,
+                                    'failure_count': self.failure_count
+                                }
+                            )
+                        raise CircuitBreakerOpenError(self.service_name)
 
         try:
             # Execute function
@@ -112,21 +140,24 @@ class CircuitBreaker:
             return result
 
         except self.expected_exception as e:
-            # Record failure
-            self._on_failure()
+            self._record_failure(e)
+            raise
+
+    def _record_failure(self, error: Exception):
+        """Count the failure being handled and log it."""
+        self._on_failure()
 
+        if logger.isEnabledFor(logging.ERROR):
             logger.error(
-                f"Circuit breaker recorded failure for {self.service_name}",
+                "Circuit breaker recorded failure for %s", self.service_name,
                 extra={
                     'service': self.service_name,
                     'state': self.state.value,
                     'failure_count': self.failure_count,
-                    'error': str(e)
+                    'error': str(error)
                 }
             )
 
-            raise
-
     def _should_attempt_reset(self) -> bool:
         """
         Check if enough time has passed to attempt reset.
@@ -134,81 +165,93 @@ class CircuitBreaker:
         Returns:
             Boolean indicating if reset should be attempted
         """
-        if self.last_failure_time is None:
+        if self.last_failure_ns is None:
             return True
 
-        return time.time() - self.last_failure_time >= self.recovery_timeout
+        return time.monotonic_ns() - self.last_failure_ns >= self.recovery_timeout_ns
 
     def _on_success(self):
         """Handle successful function execution."""
-        self.success_count += 1
+        with self._lock:
+            self.success_count += 1
 
-        if self.state == CircuitState.HALF_OPEN:
-            # Service has recovered, close the circuit
-            self._transition_to_closed()
-        elif self.state == CircuitState.CLOSED:
-            # Reset failure count on success
-            self.failure_count = 0
+            if self.state is CircuitState.HALF_OPEN:
+                # Service has recovered, close the circuit
+                self._transition_to_closed()
+            elif self.state is CircuitState.CLOSED:
+                # Reset failure count on success
+                self.failure_count = 0
+                self.call = self._fast_call
 
     def _on_failure(self):
         """Handle failed function execution."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-
-        if self.state == CircuitState.HALF_OPEN:
-            # Service still failing, reopen circuit
-            self._transition_to_open()
-        elif self.failure_count >= self.failure_threshold:
-            # Threshold reached, open circuit
-            self._transition_to_open()
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_ns = time.monotonic_ns()
+            self.last_failure_time = time.time()
+
+            if self.state is CircuitState.HALF_OPEN:
+                # Service still failing, reopen circuit
+                self._transition_to_open()
+            elif self.state is CircuitState.CLOSED and self.failure_count >= self.failure_threshold:
+                # Threshold reached, open circuit
+                self._transition_to_open()
 
     def _transition_to_open(self):
         """Transition circuit to OPEN state."""
         self.state = CircuitState.OPEN
-        logger.warning(
-            f"Circuit breaker OPENED for {self.service_name}",
-            extra={
-                'service': self.service_name,
-                'state': self.state.value,
-                'failure_count': self.failure_count
-            }
-        )
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                "Circuit breaker OPENED for %s", self.service_name,
+                extra={
+                    'service': self.service_name,
+                    'state': self.state.value,
+                    'failure_count': self.failure_count
+                }
+            )
 
     def _transition_to_half_open(self):
         """Transition circuit to HALF_OPEN state."""
         self.state = CircuitState.HALF_OPEN
         self.success_count = 0
-        logger.info(
-            f"Circuit breaker HALF_OPEN for {self.service_name}",
-            extra={
-                'service': self.service_name,
-                'state': self.state.value
-            }
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Circuit breaker HALF_OPEN for %s", self.service_name,
+                extra={
+                    'service': self.service_name,
+                    'state': self.state.value
+                }
+            )
 
     def _transition_to_closed(self):
         """Transition circuit to CLOSED state."""
         self.state = CircuitState.CLOSED
         self.failure_count = 0
-        logger.info(
-            f"Circuit breaker CLOSED for {self.service_name}",
-            extra={
-                'service': self.service_name,
-                'state': self.state.value
-            }
-        )
+        self.call = self._fast_call
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Circuit breaker CLOSED for %s", self.service_name,
+                extra={
+                    'service': self.service_name,
+                    'state': self.state.value
+                }
+            )
 
     def reset(self):
         """Manually reset the circuit breaker."""
-        self.state = CircuitState.CLOSED
-        self.failure_count = 0
-        self.success_count = 0
-        self.last_failure_time = None
-
-        logger.info(
-            f"Circuit breaker manually reset for {self.service_name}",
-            extra={'service': self.service_name}
-        )
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failure_count = 0
+            self.success_count = 0
+            self.last_failure_time = None
+            self.last_failure_ns = None
+            self.call = self._fast_call
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Circuit breaker manually reset for %s", self.service_name,
+                extra={'service': self.service_name}
+            )
 
     def get_state(self) -> dict:
         """
@@ -228,6 +271,7 @@ class CircuitBreaker:
 
 # Global circuit breakers for each service
 _circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
 
 
 def get_circuit_breaker(service_name: str, **kwargs) -> CircuitBreaker:
@@ -241,16 +285,23 @@ def get_circuit_breaker(service_name: str, **kwargs) -> CircuitBreaker:
     Returns:
         CircuitBreaker instance
     """
-    if service_name not in _circuit_breakers:
-        _circuit_breakers[service_name] = CircuitBreaker(service_name, **kwargs)
+    breaker = _circuit_breakers.get(service_name)
+    if breaker is None:
+        with _circuit_breakers_lock:
+            breaker = _circuit_breakers.get(service_name)
+            if breaker is None:
+                breaker = _circuit_breakers[service_name] = CircuitBreaker(service_name, **kwargs)
 
-    return _circuit_breakers[service_name]
+    return breaker
 
 
 def with_circuit_breaker(service_name: str, **breaker_kwargs):
     """
     Decorator to protect function with circuit breaker.
 
+    The breaker is looked up once, when the decorator is created, so
+    protected calls go straight to it.
+
     Args:
         service_name: Name of the service
         **breaker_kwargs: Circuit breaker configuration options
@@ -258,10 +309,11 @@ def with_circuit_breaker(service_name: str, **breaker_kwargs):
     Returns:
         Decorated function
     """
+    circuit_breaker = get_circuit_breaker(service_name, **breaker_kwargs)
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
-            circuit_breaker = get_circuit_breaker(service_name, **breaker_kwargs)
             return circuit_breaker.call(func, *args, **kwargs)
 
         return wrapper
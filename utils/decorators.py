@@ -2,13 +2,23 @@
 Custom decorators for cross-cutting concerns.
 """
 
+import logging
+import math
+import threading
 import time
+from collections import OrderedDict
+from datetime import datetime
 from functools import wraps
-from flask import request, g
-from database.models import db, AuditLog
+import orjson
+from flask import after_this_request, current_app, request, g
+from configs.config import Config
+from utils.audit_queue import audit_queue, write_audit_rows
 from utils.auth import get_current_user
+from utils.cache import cache
 from utils.logger import setup_logger
-from utils.responses import rate_limit_response
+from utils.responses import (
+    error_response, forbidden_response, rate_limit_response, server_error_response
+)
 from utils.exceptions import SMRException
 
 logger = setup_logger(__name__)
@@ -18,6 +28,11 @@ def audit_log(action: str, resource_type: str = None):
     """
     Decorator to automatically log actions to audit log.
 
+    Rows are handed to the background audit queue unless AUDIT_LOG_ASYNC is
+    off or the queue is full, in which case they are collected on the request
+    and written together in one transaction once the response is ready.
+    With AUDIT_ENABLED off the function is returned undecorated.
+
     Args:
         action: Action being performed
         resource_type: Type of resource being affected
@@ -25,76 +40,106 @@ def audit_log(action: str, resource_type: str = None):
     Returns:
         Decorated function
     """
+    if not Config.AUDIT_ENABLED:
+        return lambda fn: fn
+
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            user = get_current_user()
-            user_id = user['user_id'] if user else None
-
-            # Get request details
-            ip_address = request.remote_addr
-            user_agent = request.headers.get('User-Agent')
+            row = _new_audit_row(action, resource_type)
 
             try:
                 # Execute the function
                 result = fn(*args, **kwargs)
-
-                # Log successful action
-                audit_entry = AuditLog(
-                    user_id=user_id,
-                    service=request.blueprint or 'unknown',
-                    action=action,
-                    resource_type=resource_type,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    success=True
-                )
-                db.session.add(audit_entry)
-                db.session.commit()
-
-                return result
-
             except Exception as e:
                 # Log failed action
-                audit_entry = AuditLog(
-                    user_id=user_id,
-                    service=request.blueprint or 'unknown',
-                    action=action,
-                    resource_type=resource_type,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    success=False,
-                    error_message=str(e)
-                )
-                db.session.add(audit_entry)
-                db.session.commit()
-
+                row['success'] = False
+                row['error_message'] = str(e)
+                _record_audit_row(row)
                 raise
 
+            # Log successful action
+            _record_audit_row(row)
+            return result
+
         return wrapper
     return decorator
 
 
+def _new_audit_row(action: str, resource_type: str = None) -> dict:
+    """Build the AuditLog column values for the current request, marked successful."""
+    user = get_current_user()
+    now = datetime.utcnow()
+    return {
+        'user_id': user['user_id'] if user else None,
+        'service': request.blueprint or 'unknown',
+        'action': action,
+        'resource_type': resource_type,
+        'ip_address': request.remote_addr,
+        'user_agent': request.headers.get('User-Agent'),
+        'success': True,
+        'error_message': None,
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+def _record_audit_row(row: dict) -> None:
+    """Queue an audit row, deferring it to the end of the request when queuing is off or full."""
+    app = current_app._get_current_object()
+    if app.config.get('AUDIT_LOG_ASYNC', True) and audit_queue.put(app, row):
+        return
+
+    rows = g.get('_audit_rows')
+    if rows is None:
+        rows = g._audit_rows = []
+        after_this_request(_flush_request_audit_rows)
+    rows.append(row)
+
+
+def _flush_request_audit_rows(response):
+    """
+    Write the audit rows collected during this request in a single commit.
+
+    Runs whenever Flask builds a response, including error responses, so rows
+    for failed actions are written too. Rows go through their own session and
+    leave the request's db.session untouched; a failed write is logged and
+    the rows are dropped.
+    """
+    rows = g.pop('_audit_rows', None)
+    try:
+        write_audit_rows(rows)
+    except Exception as e:
+        logger.error("Failed to write %s audit log rows: %s", len(rows), e)
+    return response
+
+
 def measure_time(fn):
     """
     Decorator to measure and log function execution time.
 
+    With METRICS_ENABLED off the function is returned undecorated.
+
     Returns:
         Decorated function
     """
+    if not Config.METRICS_ENABLED:
+        return fn
+
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             result = fn(*args, **kwargs)
             return result
         finally:
-            duration = (time.time() - start_time) * 1000  # Convert to milliseconds
-            logger.info(
-                f"{fn.__name__} execution time: {duration:.2f}ms",
-                extra={'function': fn.__name__, 'duration_ms': duration}
-            )
+            duration = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s execution time: %.2fms", fn.__name__, duration,
+                    extra={'function': fn.__name__, 'duration_ms': duration}
+                )
 
     return wrapper
 
@@ -110,117 +155,307 @@ def handle_errors(fn):
     def wrapper(*args, **kwargs):
         try:
             return fn(*args, **kwargs)
-        except SMRException as e:
-            logger.error(f"SMR Exception in {fn.__name__}: {str(e)}")
-            from utils.responses import error_response
-            return error_response(e.message, status_code=e.status_code)
         except Exception as e:
-            logger.exception(f"Unexpected error in {fn.__name__}: {str(e)}")
-            from utils.responses import server_error_response
-            return server_error_response("An unexpected error occurred")
+            return _error_response_for(fn.__name__, e)
 
     return wrapper
 
 
+def _error_response_for(fn_name: str, error: Exception):
+    """Log an exception raised by a view and turn it into an error response."""
+    if isinstance(error, SMRException):
+        logger.error("SMR Exception in %s: %s", fn_name, error)
+        return error_response(error.message, status_code=error.status_code)
+
+    logger.exception("Unexpected error in %s: %s", fn_name, error)
+    return server_error_response("An unexpected error occurred")
+
+
+def _is_json_content_type(content_type: str) -> bool:
+    """
+    Check a raw Content-Type header the way request.is_json does.
+
+    Only the media type before any parameters is inspected, which avoids
+    werkzeug's full header parsing.
+
+    Args:
+        content_type: Content-Type header value
+
+    Returns:
+        True for application/json and application/*+json
+    """
+    mimetype = content_type.partition(';')[0].strip().lower()
+    return mimetype == 'application/json' or (
+        mimetype.startswith('application/') and mimetype.endswith('+json')
+    )
+
+
 def validate_json(fn):
     """
-    Decorator to validate that request contains valid JSON.
+    Decorator to validate that request contains a JSON object.
+
+    The body is parsed once with orjson and stored on g.json for the handler.
 
     Returns:
         Decorated function
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        if not request.is_json:
-            from utils.responses import error_response
-            return error_response("Request must be JSON", status_code=400)
-
+        invalid = _load_json_body()
+        if invalid is not None:
+            return invalid
         return fn(*args, **kwargs)
 
     return wrapper
 
 
-class SimpleRateLimiter:
-    """Simple in-memory rate limiter."""
+def _load_json_body():
+    """Parse the request body into g.json, returning an error response if it is not a JSON object."""
+    if not _is_json_content_type(request.environ.get('CONTENT_TYPE', '')):
+        return error_response("Request must be JSON", status_code=400)
+
+    try:
+        data = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return error_response("Invalid JSON", status_code=400)
+
+    if not isinstance(data, dict):
+        return error_response("Request body must be a JSON object", status_code=400)
+
+    g.json = data
+    return None
+
+
+# Atomically refill and take one token from a bucket stored as {tokens, ts} in a hash.
+# ARGV: capacity, refill rate (tokens/second), current time (ms).
+# Returns {allowed (0/1), remaining tokens * 1000} since Lua numbers are truncated on return.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, math.floor(tokens * 1000)}
+"""
+
+
+class TokenBucketRateLimiter:
+    """
+    Token-bucket rate limiter.
+
+    Buckets live in Redis and are updated by a single EVALSHA round-trip;
+    when Redis is unavailable an in-process bucket per key is used instead.
+    In-process buckets are kept in least-recently-used order: buckets that
+    have refilled completely are dropped as new keys arrive, and each shard
+    holds at most max_keys / shards buckets.
+    """
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        # Fallback buckets are sharded by key hash so threads on different keys don't share a lock
+        self.shards = [(OrderedDict(), threading.Lock()) for _ in range(shards)]
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self._script = None
+
+    def _redis_script(self):
+        """Return the registered Lua script, or None when Redis is disabled."""
+        if not cache.enabled:
+            return None
 
-    def __init__(self):
-        self.requests = {}
+        if self._script is None:
+            self._script = cache.redis_client.register_script(TOKEN_BUCKET_SCRIPT)
 
-    def is_allowed(self, key: str, limit: int, window: int) -> bool:
+        return self._script
+
+    def take(self, key: str, capacity: int, refill_per_sec: float) -> tuple:
         """
-        Check if request is allowed based on rate limit.
+        Take one token from the bucket for key.
 
         Args:
-            key: Rate limit key (e.g., IP address or user ID)
-            limit: Maximum number of requests
-            window: Time window in seconds
+            key: Rate limit key (e.g., IP address or user ID plus endpoint)
+            capacity: Bucket size (maximum burst)
+            refill_per_sec: Tokens added back per second
 
         Returns:
-            Boolean indicating if request is allowed
+            Tuple of (allowed, remaining tokens)
         """
-        now = time.time()
-
-        # Clean old entries
-        if key in self.requests:
-            self.requests[key] = [
-                timestamp for timestamp in self.requests[key]
-                if now - timestamp < window
-            ]
-        else:
-            self.requests[key] = []
-
-        # Check if limit exceeded
-        if len(self.requests[key]) >= limit:
-            return False
-
-        # Add current request
-        self.requests[key].append(now)
-        return True
+        script = self._redis_script()
+        if script is not None:
+            # Buckets in Redis are shared across processes, so they need wall-clock time
+            now_ms = int(time.time() * 1000)
+            try:
+                allowed, remaining = script(keys=[f"ratelimit:{key}"], args=[capacity, refill_per_sec, now_ms])
+                return bool(allowed), int(remaining) / 1000
+            except Exception as e:
+                logger.error("Rate limit script error for %s: %s", key, e)
+
+        # In-process buckets only need deltas, which the monotonic clock keeps correct across clock changes
+        now_ms = time.monotonic_ns() // 1_000_000
+        buckets, lock = self.shards[hash(key) % len(self.shards)]
+        with lock:
+            tokens, ts, _ = buckets.pop(key, (capacity, now_ms, now_ms))
+            tokens = min(capacity, tokens + max(0, now_ms - ts) * refill_per_sec / 1000)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            # A bucket is indistinguishable from a new one once it has refilled
+            full_at_ms = now_ms + int((capacity - tokens) * 1000 / refill_per_sec)
+            buckets[key] = (tokens, now_ms, full_at_ms)
+            self._evict(buckets, now_ms)
+
+        return allowed, tokens
+
+    def _evict(self, buckets: OrderedDict, now_ms: int) -> None:
+        """Drop refilled buckets from the old end of a shard, then enforce its size cap."""
+        while buckets:
+            oldest_key, (_, _, full_at_ms) = next(iter(buckets.items()))
+            if full_at_ms > now_ms and len(buckets) <= self.max_keys_per_shard:
+                break
+            del buckets[oldest_key]
 
 
 # Global rate limiter instance
-rate_limiter = SimpleRateLimiter()
+rate_limiter = TokenBucketRateLimiter()
 
 
-def rate_limit(limit: int = 60, window: int = 60, key_func=None):
+def rate_limit(limit: int = 60, window: int = 60, key_func=None,
+               capacity: int = None, refill_per_sec: float = None):
     """
-    Decorator to apply rate limiting to routes.
+    Decorator to apply token-bucket rate limiting to routes.
+
+    The bucket holds capacity tokens and refills at refill_per_sec; limit and
+    window are shorthand for capacity=limit, refill_per_sec=limit/window.
+    Buckets are kept per client and endpoint.
 
     Args:
         limit: Maximum number of requests
         window: Time window in seconds
         key_func: Optional function to generate rate limit key
+        capacity: Bucket size (overrides limit)
+        refill_per_sec: Refill rate in tokens per second (overrides limit/window)
 
     Returns:
         Decorated function
     """
+    if capacity is None:
+        capacity = limit
+    if refill_per_sec is None:
+        refill_per_sec = limit / window
+
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            # Generate rate limit key
-            if key_func:
-                key = key_func()
-            else:
-                user = get_current_user()
-                if user:
-                    key = f"user:{user['user_id']}"
-                else:
-                    key = f"ip:{request.remote_addr}"
-
-            # Check rate limit
-            if not rate_limiter.is_allowed(key, limit, window):
-                logger.warning(f"Rate limit exceeded for {key}")
-                return rate_limit_response(
-                    message=f"Rate limit exceeded. Maximum {limit} requests per {window} seconds.",
-                    retry_after=window
-                )
-
+            limited = _check_rate_limit(key_func, capacity, refill_per_sec)
+            if limited is not None:
+                return limited
             return fn(*args, **kwargs)
 
         return wrapper
     return decorator
 
 
+def _check_rate_limit(key_func, capacity: int, refill_per_sec: float):
+    """Take a token for the current client, returning a 429 response if none is left."""
+    # Generate rate limit key
+    if key_func:
+        key = key_func()
+    else:
+        user = get_current_user()
+        if user:
+            key = f"user:{user['user_id']}:{request.endpoint}"
+        else:
+            key = f"ip:{request.remote_addr}:{request.endpoint}"
+
+    # Check rate limit
+    allowed, remaining = rate_limiter.take(key, capacity, refill_per_sec)
+    if not allowed:
+        logger.warning("Rate limit exceeded for %s", key)
+        return rate_limit_response(
+            message=f"Rate limit exceeded. Maximum {capacity} requests per "
+                    f"{capacity / refill_per_sec:.0f} seconds.",
+            retry_after=math.ceil((1 - remaining) / refill_per_sec)
+        )
+    return None
+
+
+def guard(json_body: bool = False, audit: str = None, resource_type: str = None,
+          limit: int = None, window: int = 60, key_func=None,
+          capacity: int = None, refill_per_sec: float = None):
+    """
+    Fused replacement for stacking handle_errors, validate_json, rate_limit and audit_log.
+
+    Behaves like those decorators applied in that order (handle_errors
+    outermost) but runs them in a single wrapper frame: malformed bodies and
+    rate-limited requests are rejected before an audit row is built. Each
+    stage is optional and skipped entirely when not requested.
+
+    Args:
+        json_body: Require a JSON object body, stored on g.json
+        audit: Audit action to record, as in audit_log
+        resource_type: Audited resource type
+        limit: Rate limit requests per window; rate limiting is off unless
+            limit or capacity is given
+        window: Rate limit window in seconds
+        key_func: Optional function to generate the rate limit key
+        capacity: Token bucket size (overrides limit)
+        refill_per_sec: Refill rate in tokens per second (overrides limit/window)
+
+    Returns:
+        Decorator
+    """
+    if not Config.AUDIT_ENABLED:
+        audit = None
+    if capacity is None:
+        capacity = limit
+    if capacity is not None and refill_per_sec is None:
+        refill_per_sec = capacity / window
+
+    def decorator(fn):
+        fn_name = fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                if json_body:
+                    invalid = _load_json_body()
+                    if invalid is not None:
+                        return invalid
+
+                if capacity is not None:
+                    limited = _check_rate_limit(key_func, capacity, refill_per_sec)
+                    if limited is not None:
+                        return limited
+
+                if audit is None:
+                    return fn(*args, **kwargs)
+
+                row = _new_audit_row(audit, resource_type)
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    row['success'] = False
+                    row['error_message'] = str(e)
+                    _record_audit_row(row)
+                    raise
+
+                _record_audit_row(row)
+                return result
+            except Exception as e:
+                return _error_response_for(fn_name, e)
+
+        return wrapper
+    return decorator
+
+
 def cache_response(ttl: int = 300):
     """
     Decorator to cache response (requires Redis implementation).
@@ -254,7 +489,6 @@ def require_service_account(fn):
         user = get_current_user()
 
         if not user or user['role'] != 'service':
-            from utils.responses import forbidden_response
             return forbidden_response("Service account required")
 
         return fn(*args, **kwargs)
@@ -6,15 +6,35 @@ Custom exception classes for the Smart Meeting Room System.
 class SMRException(Exception):
     """Base exception class for Smart Meeting Room System."""
 
+    # Slots keep raised exceptions from allocating a per-instance __dict__
+    __slots__ = ('message', 'status_code')
+
     def __init__(self, message: str, status_code: int = 500):
         self.message = message
         self.status_code = status_code
         super().__init__(self.message)
 
+    def __reduce__(self):
+        """
+        Pickle slot attributes, which BaseException.__reduce__ would drop.
+
+        Unpickling goes through __new__ rather than __init__ so subclasses whose
+        constructors rewrite the message are restored as they were raised.
+        """
+        state = {
+            name: getattr(self, name)
+            for klass in type(self).__mro__
+            for name in klass.__dict__.get('__slots__', ())
+            if hasattr(self, name)
+        }
+        return type(self).__new__, (type(self), *self.args), state
+
 
 class ValidationError(SMRException):
     """Exception raised for validation errors."""
 
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message, status_code=400)
 
@@ -22,6 +42,8 @@ class ValidationError(SMRException):
 class AuthenticationError(SMRException):
     """Exception raised for authentication failures."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Authentication failed"):
         super().__init__(message, status_code=401)
 
@@ -29,6 +51,8 @@ class AuthenticationError(SMRException):
 class AuthorizationError(SMRException):
     """Exception raised for authorization failures."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Access forbidden"):
         super().__init__(message, status_code=403)
 
@@ -36,6 +60,8 @@ class AuthorizationError(SMRException):
 class NotFoundError(SMRException):
     """Exception raised when resource is not found."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Resource not found"):
         super().__init__(message, status_code=404)
 
@@ -43,6 +69,8 @@ class NotFoundError(SMRException):
 class ConflictError(SMRException):
     """Exception raised for resource conflicts."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Resource conflict"):
         super().__init__(message, status_code=409)
 
@@ -50,6 +78,8 @@ class ConflictError(SMRException):
 class RateLimitError(SMRException):
     """Exception raised when rate limit is exceeded."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Rate limit exceeded"):
         super().__init__(message, status_code=429)
 
@@ -57,6 +87,8 @@ class RateLimitError(SMRException):
 class ServiceUnavailableError(SMRException):
     """Exception raised when service is unavailable."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Service temporarily unavailable"):
         super().__init__(message, status_code=503)
 
@@ -64,6 +96,8 @@ class ServiceUnavailableError(SMRException):
 class DatabaseError(SMRException):
     """Exception raised for database errors."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Database error occurred"):
         super().__init__(message, status_code=500)
 
@@ -71,6 +105,8 @@ class DatabaseError(SMRException):
 class ExternalServiceError(SMRException):
     """Exception raised when external service call fails."""
 
+    __slots__ = ('service_name',)
+
     def __init__(self, message: str = "External service error", service_name: str = None):
         self.service_name = service_name
         super().__init__(message, status_code=502)
@@ -79,6 +115,8 @@ class ExternalServiceError(SMRException):
 class BookingConflictError(ConflictError):
     """Exception raised when booking time slot conflicts with existing booking."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Booking time slot is already reserved"):
         super().__init__(message)
 
@@ -86,6 +124,8 @@ class BookingConflictError(ConflictError):
 class AccountLockedError(AuthenticationError):
     """Exception raised when user account is locked."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Account is locked due to too many failed login attempts"):
         super().__init__(message)
 
@@ -93,6 +133,8 @@ class AccountLockedError(AuthenticationError):
 class CircuitBreakerOpenError(ServiceUnavailableError):
     """Exception raised when circuit breaker is open."""
 
+    __slots__ = ('service_name',)
+
     def __init__(self, service_name: str):
         super().__init__(f"Circuit breaker is open for {service_name}")
         self.service_name = service_name
@@ -2,9 +2,15 @@
 HTTP client for inter-service communication with circuit breaker support.
 """
 
+import logging
+import orjson
+import os
 import requests
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout
+from urllib3.util.retry import Retry
 from configs.config import Config
 from utils.circuit_breaker import with_circuit_breaker
 from utils.logger import setup_logger
@@ -12,6 +18,10 @@ from utils.exceptions import ExternalServiceError
 
 logger = setup_logger(__name__)
 
+# Keep-alive connections kept per target service
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 50
+
 
 class ServiceClient:
     """
@@ -37,6 +47,15 @@ class ServiceClient:
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
 
+        # One session per client reuses keep-alive connections across calls;
+        # idempotent requests are retried briefly on gateway errors
+        self._session = requests.Session()
+        self._session.mount(self.base_url, HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+        ))
+
     @with_circuit_breaker('http_request', failure_threshold=5, recovery_timeout=60)
     def _make_request(
         self,
@@ -65,7 +84,7 @@ class ServiceClient:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
 
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
                 json=data,
@@ -75,21 +94,22 @@ class ServiceClient:
             )
 
             # Log request
-            logger.info(
-                f"Service request: {method} {url}",
-                extra={
-                    'service': self.service_name,
-                    'method': method,
-                    'url': url,
-                    'status_code': response.status_code
-                }
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Service request: %s %s", method, url,
+                    extra={
+                        'service': self.service_name,
+                        'method': method,
+                        'url': url,
+                        'status_code': response.status_code
+                    }
+                )
 
             # Check for error status codes
             if response.status_code >= 400:
                 error_message = f"{self.service_name} returned {response.status_code}"
                 try:
-                    error_data = response.json()
+                    error_data = orjson.loads(response.content)
                     error_message = error_data.get('error', error_message)
                 except:
                     pass
@@ -97,7 +117,7 @@ class ServiceClient:
                 raise ExternalServiceError(error_message, self.service_name)
 
             # Return JSON response
-            return response.json()
+            return orjson.loads(response.content)
 
         except Timeout:
             error_msg = f"Request to {self.service_name} timed out"
@@ -172,24 +192,38 @@ class ServiceClient:
 
 # Service client instances
 class ServiceClients:
-    """Container for all service clients."""
+    """Container for all service clients; each client is created once and shared."""
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def users() -> ServiceClient:
         """Get Users service client."""
         return ServiceClient('users-service', Config.USER_SERVICE_URL)
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def rooms() -> ServiceClient:
         """Get Rooms service client."""
         return ServiceClient('rooms-service', Config.ROOM_SERVICE_URL)
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def bookings() -> ServiceClient:
         """Get Bookings service client."""
         return ServiceClient('bookings-service', Config.BOOKING_SERVICE_URL)
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def reviews() -> ServiceClient:
         """Get Reviews service client."""
         return ServiceClient('reviews-service', Config.REVIEW_SERVICE_URL)
+
+    @staticmethod
+    def reset() -> None:
+        """Drop the shared clients so the next call builds fresh ones."""
+        for factory in (ServiceClients.users, ServiceClients.rooms, ServiceClients.bookings, ServiceClients.reviews):
+            factory.cache_clear()
+
+
+# Forked workers must not share the parent's pooled sockets
+os.register_at_fork(after_in_child=ServiceClients.reset)
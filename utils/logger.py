@@ -2,13 +2,149 @@
 Logging utilities for structured application logging.
 """
 
+import atexit
 import logging
+import orjson
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from pythonjsonlogger import jsonlogger
 from configs.config import Config
 
 
+# LogRecord attributes that are part of every record; anything else was
+# passed through extra= and is emitted as its own JSON field
+_RESERVED_RECORD_ATTRS = frozenset(
+    logging.LogRecord('', logging.INFO, '', 0, '', (), None).__dict__
+) | {'message', 'asctime'}
+
+
+# Log level from config, resolved once for every logger
+_LOG_LEVEL = getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO)
+
+# Loggers already configured by setup_logger, keyed by (name, log_file)
+_configured_loggers = {}
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Format log records as single-line JSON objects encoded with orjson.
+
+    Emits asctime, name, levelname and message followed by any extra fields,
+    matching the layout previously produced by python-json-logger.
+    """
+
+    def __init__(self, datefmt: str = '%Y-%m-%d %H:%M:%S'):
+        """
+        Initialize formatter.
+
+        Args:
+            datefmt: strftime format for the asctime field
+        """
+        super().__init__(datefmt=datefmt)
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Serialize a log record to JSON.
+
+        Args:
+            record: Log record to format
+
+        Returns:
+            JSON document as a string
+        """
+        data = {
+            'asctime': self.formatTime(record, self.datefmt),
+            'name': record.name,
+            'levelname': record.levelname,
+            'message': record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                data[key] = value
+
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc_info'] = record.exc_text
+        if record.stack_info:
+            data['stack_info'] = self.formatStack(record.stack_info)
+
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves JSON formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Freeze the message text without formatting the record.
+
+        Args:
+            record: Log record about to be enqueued
+
+        Returns:
+            The same record with its arguments merged into msg
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _LoggerDispatchListener(QueueListener):
+    """
+    Single background listener shared by every logger in the process.
+
+    Each record is routed to the console/file handlers registered for the
+    logger that emitted it, so one thread serves all module loggers.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        """
+        Initialize listener.
+
+        Args:
+            log_queue: Queue fed by the loggers' QueueHandlers
+        """
+        super().__init__(log_queue, respect_handler_level=True)
+        self.routes = {}
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """
+        Emit a record through the handlers of its originating logger.
+
+        Args:
+            record: Dequeued log record
+        """
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_log_queue = queue.Queue(-1)
+_queue_handlers = []
+_listener = _LoggerDispatchListener(_log_queue)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def _restart_listener_in_child() -> None:
+    """Give a forked worker its own queue and listener thread."""
+    global _log_queue
+    _log_queue = queue.Queue(-1)
+    for handler in _queue_handlers:
+        handler.queue = _log_queue
+    _listener.queue = _log_queue
+    _listener._thread = None
+    _listener.start()
+
+
+# Threads do not survive fork; each worker restarts the listener
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
 def setup_logger(name: str, log_file: str = None) -> logging.Logger:
     """
     Setup and configure logger with JSON formatting.
@@ -20,27 +156,27 @@ def setup_logger(name: str, log_file: str = None) -> logging.Logger:
     Returns:
         Configured logger instance
     """
-    logger = logging.getLogger(name)
+    key = (name, log_file)
+    logger = _configured_loggers.get(key)
+    if logger is not None:
+        return logger
 
-    # Set log level from config
-    log_level = getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO)
-    logger.setLevel(log_level)
+    logger = logging.getLogger(name)
+    logger.setLevel(_LOG_LEVEL)
 
     # Avoid duplicate handlers
     if logger.handlers:
+        _configured_loggers[key] = logger
         return logger
 
     # JSON formatter for structured logging
-    formatter = jsonlogger.JsonFormatter(
-        '%(asctime)s %(name)s %(levelname)s %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    formatter = OrjsonFormatter()
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
+    console_handler.setLevel(_LOG_LEVEL)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler if log file specified
     if log_file:
@@ -48,10 +184,17 @@ def setup_logger(name: str, log_file: str = None) -> logging.Logger:
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
+        file_handler.setLevel(_LOG_LEVEL)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Request threads only enqueue; the listener thread formats and writes
+    _listener.routes[name] = handlers
+    queue_handler = _DeferredQueueHandler(_log_queue)
+    _queue_handlers.append(queue_handler)
+    logger.addHandler(queue_handler)
 
+    _configured_loggers[key] = logger
     return logger
 
 
@@ -69,6 +212,9 @@ def log_request(logger: logging.Logger, method: str, endpoint: str, user_id: int
         endpoint: Request endpoint
         user_id: Optional user ID
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     logger.info(
         'Incoming request',
         extra={
@@ -93,6 +239,9 @@ def log_response(logger: logging.Logger, method: str, endpoint: str, status_code
         duration_ms: Request duration in milliseconds
         user_id: Optional user ID
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     logger.info(
         'Response sent',
         extra={
@@ -115,6 +264,9 @@ def log_error(logger: logging.Logger, error: Exception, context: dict = None):
         error: Exception object
         context: Optional context dictionary
     """
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+
     log_data = {
         'event_type': 'error',
         'error_type': type(error).__name__,
@@ -140,6 +292,9 @@ def log_audit(logger: logging.Logger, user_id: int, action: str, resource_type:
         resource_id: Optional resource ID
         details: Optional additional details
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     log_data = {
         'event_type': 'audit',
         'user_id': user_id,
@@ -2,10 +2,53 @@
 Standardized API response utilities.
 """
 
-from flask import jsonify
+import orjson
+from flask import current_app, jsonify
+from flask.json.provider import DefaultJSONProvider
 from typing import Any, Dict, List, Optional
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Serializes straight to bytes and handles datetime natively (ISO 8601),
+    falling back to Flask's default hook for Decimal, UUID and dataclasses.
+    Keys are not sorted.
+
+    Example:
+        app.json = OrjsonProvider(app)
+    """
+
+    sort_keys = False
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize obj to a JSON string."""
+        return orjson.dumps(obj, default=self.default, option=self.options).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        """Deserialize a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Serialize the arguments into a JSON response without an intermediate str."""
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.options)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def _error(message: str, status_code: int):
+    """
+    Build a plain error response serialized straight to bytes.
+
+    Bodies are not memoized: messages often embed request data, and a cache
+    keyed on them would fill with attacker-chosen strings.
+    """
+    body = orjson.dumps({'success': False, 'error': message})
+    return current_app.response_class(body, mimetype='application/json'), status_code
+
+
 def success_response(data: Any = None, message: str = None, status_code: int = 200):
     """
     Create successful API response.
@@ -99,7 +142,7 @@ def paginated_response(items: List[Any], page: int, per_page: int, total: int,
         message: Optional message
 
     Returns:
-        Flask JSON response
+        Flask JSON response, serialized with orjson
     """
     total_pages = (total + per_page - 1) // per_page
 
@@ -119,7 +162,9 @@ def paginated_response(items: List[Any], page: int, per_page: int, total: int,
     if message:
         response['message'] = message
 
-    return jsonify(response), 200
+    # Pages are the largest payloads; orjson encodes straight to bytes in one pass
+    body = orjson.dumps(response, default=current_app.json.default)
+    return current_app.response_class(body, mimetype='application/json'), 200
 
 
 def validation_error_response(errors: Dict[str, List[str]]):
@@ -149,10 +194,7 @@ def unauthorized_response(message: str = "Authentication required"):
     Returns:
         Flask JSON response
     """
-    return jsonify({
-        'success': False,
-        'error': message
-    }), 401
+    return _error(message, 401)
 
 
 def forbidden_response(message: str = "Access forbidden"):
@@ -165,10 +207,7 @@ def forbidden_response(message: str = "Access forbidden"):
     Returns:
         Flask JSON response
     """
-    return jsonify({
-        'success': False,
-        'error': message
-    }), 403
+    return _error(message, 403)
 
 
 def not_found_response(message: str = "Resource not found"):
@@ -181,10 +220,7 @@ def not_found_response(message: str = "Resource not found"):
     Returns:
         Flask JSON response
     """
-    return jsonify({
-        'success': False,
-        'error': message
-    }), 404
+    return _error(message, 404)
 
 
 def conflict_response(message: str = "Resource conflict"):
@@ -197,10 +233,7 @@ def conflict_response(message: str = "Resource conflict"):
     Returns:
         Flask JSON response
     """
-    return jsonify({
-        'success': False,
-        'error': message
-    }), 409
+    return _error(message, 409)
 
 
 def rate_limit_response(message: str = "Rate limit exceeded", retry_after: int = None):
@@ -214,15 +247,12 @@ def rate_limit_response(message: str = "Rate limit exceeded", retry_after: int =
     Returns:
         Flask JSON response
     """
-    response = jsonify({
-        'success': False,
-        'error': message
-    })
+    response, status_code = _error(message, 429)
 
     if retry_after:
         response.headers['Retry-After'] = str(retry_after)
 
-    return response, 429
+    return response, status_code
 
 
 def server_error_response(message: str = "Internal server error"):
@@ -235,10 +265,7 @@ def server_error_response(message: str = "Internal server error"):
     Returns:
         Flask JSON response
     """
-    return jsonify({
-        'success': False,
-        'error': message
-    }), 500
+    return _error(message, 500)
 
 
 def service_unavailable_response(message: str = "Service temporarily unavailable"):
@@ -251,7 +278,4 @@ def service_unavailable_response(message: str = "Service temporarily unavailable
     Returns:
         Flask JSON response
     """
-    return jsonify({
-        'success': False,
-        'error': message
-    }), 503
+    return _error(message, 503)
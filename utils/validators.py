@@ -4,8 +4,49 @@ Input validation utilities for request data validation.
 
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
-from email_validator import validate_email, EmailNotValidError
+from email_validator import validate_email, EmailNotValidError, EmailUndeliverableError
+
+
+# Compiled once at import; validators run on every auth request
+_EMAIL_SHAPE_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+_USERNAME_RE = re.compile(r'[a-zA-Z0-9_-]+')
+
+# Ordered for error messages; the frozensets back the membership checks
+VALID_ROLES = ('admin', 'user', 'facility_manager', 'moderator', 'auditor', 'service')
+_VALID_ROLES = frozenset(VALID_ROLES)
+VALID_ROOM_STATUSES = ('available', 'booked', 'maintenance', 'out_of_service')
+_VALID_ROOM_STATUSES = frozenset(VALID_ROOM_STATUSES)
+VALID_BOOKING_STATUSES = ('pending', 'confirmed', 'cancelled', 'completed', 'no_show')
+_VALID_BOOKING_STATUSES = frozenset(VALID_BOOKING_STATUSES)
+VALID_RECURRENCE_PATTERNS = ('daily', 'weekly', 'monthly')
+_VALID_RECURRENCE_PATTERNS = frozenset(VALID_RECURRENCE_PATTERNS)
+
+MAX_ROOM_CAPACITY = 1000
+MIN_BOOKING_DURATION = timedelta(minutes=30)
+MAX_BOOKING_DURATION = timedelta(days=7)
+MIN_RATING = 1
+MAX_RATING = 5
+
+_PASSWORD_SPECIAL_CHARS = b'!@#$%^&*(),.?":{}|<>'
+
+
+def _classify_password_byte(byte: int) -> int:
+    """Map an ASCII byte to its password character class marker."""
+    if 65 <= byte <= 90:
+        return ord('U')
+    if 97 <= byte <= 122:
+        return ord('L')
+    if 48 <= byte <= 57:
+        return ord('D')
+    if byte in _PASSWORD_SPECIAL_CHARS:
+        return ord('S')
+    return ord('.')
+
+
+# Translation table classifying every byte in a single C-level pass
+_PASSWORD_CLASS_TABLE = bytes(_classify_password_byte(byte) for byte in range(256))
 
 
 class ValidationError(Exception):
@@ -24,7 +65,8 @@ def validate_required_fields(data: Dict, required_fields: List[str]) -> None:
     Raises:
         ValidationError: If any required field is missing
     """
-    missing_fields = [field for field in required_fields if field not in data or data[field] is None]
+    # A single get() covers both absent and None-valued fields
+    missing_fields = [field for field in required_fields if data.get(field) is None]
 
     if missing_fields:
         raise ValidationError(f"Missing required fields: {', '.join(missing_fields)}")
@@ -43,12 +85,42 @@ def validate_email_format(email: str) -> str:
     Raises:
         ValidationError: If email format is invalid
     """
+    # Reject obviously malformed input before the full (and slower) email-validator check
+    if not email or not _EMAIL_SHAPE_RE.fullmatch(email):
+        raise ValidationError("Invalid email format: The email address is not valid.")
+
     try:
-        valid = validate_email(email)
-        return valid.email
-    except EmailNotValidError as e:
+        is_valid, result = _check_email(email)
+    except EmailUndeliverableError as e:
         raise ValidationError(f"Invalid email format: {str(e)}")
 
+    if not is_valid:
+        raise ValidationError(f"Invalid email format: {result}")
+    return result
+
+
+@lru_cache(maxsize=4096)
+def _check_email(email: str) -> tuple:
+    """
+    Run email-validator once per distinct address.
+
+    Syntax errors are returned rather than raised so they are cached too.
+    Deliverability failures still raise, keeping transient DNS errors out of
+    the cache.
+
+    Args:
+        email: Email address to validate
+
+    Returns:
+        (True, normalized email) or (False, error message)
+    """
+    try:
+        return True, validate_email(email).email
+    except EmailUndeliverableError:
+        raise
+    except EmailNotValidError as e:
+        return False, str(e)
+
 
 def validate_username(username: str) -> None:
     """
@@ -66,7 +138,7 @@ def validate_username(username: str) -> None:
     if len(username) > 50:
         raise ValidationError("Username must not exceed 50 characters")
 
-    if not re.match(r'^[a-zA-Z0-9_-]+$', username):
+    if not _USERNAME_RE.fullmatch(username):
         raise ValidationError("Username can only contain letters, numbers, underscores, and hyphens")
 
 
@@ -86,16 +158,19 @@ def validate_password(password: str) -> None:
     if len(password) > 128:
         raise ValidationError("Password must not exceed 128 characters")
 
-    if not re.search(r'[A-Z]', password):
+    # Non-ASCII characters never count towards a character class
+    classes = password.encode('ascii', 'ignore').translate(_PASSWORD_CLASS_TABLE)
+
+    if b'U' not in classes:
         raise ValidationError("Password must contain at least one uppercase letter")
 
-    if not re.search(r'[a-z]', password):
+    if b'L' not in classes:
         raise ValidationError("Password must contain at least one lowercase letter")
 
-    if not re.search(r'[0-9]', password):
+    if b'D' not in classes:
         raise ValidationError("Password must contain at least one digit")
 
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if b'S' not in classes:
         raise ValidationError("Password must contain at least one special character")
 
 
@@ -109,10 +184,8 @@ def validate_role(role: str) -> None:
     Raises:
         ValidationError: If role is invalid
     """
-    valid_roles = ['admin', 'user', 'facility_manager', 'moderator', 'auditor', 'service']
-
-    if role not in valid_roles:
-        raise ValidationError(f"Invalid role. Must be one of: {', '.join(valid_roles)}")
+    if role not in _VALID_ROLES:
+        raise ValidationError(f"Invalid role. Must be one of: {', '.join(VALID_ROLES)}")
 
 
 def validate_room_capacity(capacity: int) -> None:
@@ -128,8 +201,8 @@ def validate_room_capacity(capacity: int) -> None:
     if not isinstance(capacity, int) or capacity <= 0:
         raise ValidationError("Room capacity must be a positive integer")
 
-    if capacity > 1000:
-        raise ValidationError("Room capacity cannot exceed 1000")
+    if capacity > MAX_ROOM_CAPACITY:
+        raise ValidationError(f"Room capacity cannot exceed {MAX_ROOM_CAPACITY}")
 
 
 def validate_room_status(status: str) -> None:
@@ -142,19 +215,19 @@ def validate_room_status(status: str) -> None:
     Raises:
         ValidationError: If status is invalid
     """
-    valid_statuses = ['available', 'booked', 'maintenance', 'out_of_service']
-
-    if status not in valid_statuses:
-        raise ValidationError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+    if status not in _VALID_ROOM_STATUSES:
+        raise ValidationError(f"Invalid status. Must be one of: {', '.join(VALID_ROOM_STATUSES)}")
 
 
-def validate_booking_times(start_time: datetime, end_time: datetime) -> None:
+def validate_booking_times(start_time: datetime, end_time: datetime, now: Optional[datetime] = None) -> None:
     """
     Validate booking start and end times.
 
     Args:
         start_time: Booking start time
         end_time: Booking end time
+        now: Current UTC time; callers validating many bookings can pass one
+            shared value (default: datetime.utcnow())
 
     Raises:
         ValidationError: If times are invalid
@@ -165,15 +238,15 @@ def validate_booking_times(start_time: datetime, end_time: datetime) -> None:
     if start_time >= end_time:
         raise ValidationError("End time must be after start time")
 
-    if start_time < datetime.utcnow():
+    if start_time < (now or datetime.utcnow()):
         raise ValidationError("Booking start time cannot be in the past")
 
     duration = end_time - start_time
 
-    if duration < timedelta(minutes=30):
+    if duration < MIN_BOOKING_DURATION:
         raise ValidationError("Booking duration must be at least 30 minutes")
 
-    if duration > timedelta(days=7):
+    if duration > MAX_BOOKING_DURATION:
         raise ValidationError("Booking duration cannot exceed 7 days")
 
 
@@ -187,10 +260,8 @@ def validate_booking_status(status: str) -> None:
     Raises:
         ValidationError: If status is invalid
     """
-    valid_statuses = ['pending', 'confirmed', 'cancelled', 'completed', 'no_show']
-
-    if status not in valid_statuses:
-        raise ValidationError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+    if status not in _VALID_BOOKING_STATUSES:
+        raise ValidationError(f"Invalid status. Must be one of: {', '.join(VALID_BOOKING_STATUSES)}")
 
 
 def validate_rating(rating: int) -> None:
@@ -203,10 +274,32 @@ def validate_rating(rating: int) -> None:
     Raises:
         ValidationError: If rating is invalid
     """
-    if not isinstance(rating, int) or rating < 1 or rating > 5:
+    if not isinstance(rating, int) or not MIN_RATING <= rating <= MAX_RATING:
         raise ValidationError("Rating must be an integer between 1 and 5")
 
 
+def validate_ratings_bulk(ratings: List[int]) -> None:
+    """
+    Validate many review ratings at once.
+
+    Accepts and rejects exactly what validate_rating() does, but checks the
+    bounds with builtin min()/max() and only walks the list in Python to
+    report the first bad index.
+
+    Args:
+        ratings: Ratings to validate
+
+    Raises:
+        ValidationError: If any rating is not an integer between 1 and 5
+    """
+    if not all(isinstance(rating, int) for rating in ratings):
+        raise ValidationError("Ratings must be integers between 1 and 5")
+
+    if ratings and (min(ratings) < MIN_RATING or max(ratings) > MAX_RATING):
+        index = next(i for i, rating in enumerate(ratings) if not MIN_RATING <= rating <= MAX_RATING)
+        raise ValidationError(f"Rating at index {index} must be an integer between 1 and 5")
+
+
 def validate_review_comment(comment: str) -> None:
     """
     Validate review comment.
@@ -231,10 +324,10 @@ def validate_recurrence_pattern(pattern: str) -> None:
     Raises:
         ValidationError: If pattern is invalid
     """
-    valid_patterns = ['daily', 'weekly', 'monthly']
-
-    if pattern and pattern not in valid_patterns:
-        raise ValidationError(f"Invalid recurrence pattern. Must be one of: {', '.join(valid_patterns)}")
+    if pattern and pattern not in _VALID_RECURRENCE_PATTERNS:
+        raise ValidationError(
+            f"Invalid recurrence pattern. Must be one of: {', '.join(VALID_RECURRENCE_PATTERNS)}"
+        )
 
 
 def validate_date_format(date_string: str) -> datetime:
@@ -251,7 +344,10 @@ def validate_date_format(date_string: str) -> datetime:
         ValidationError: If date format is invalid
     """
     try:
-        return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+        # fromisoformat() before Python 3.11 does not accept a 'Z' suffix
+        if date_string.endswith('Z'):
+            date_string = date_string[:-1] + '+00:00'
+        return datetime.fromisoformat(date_string)
     except (ValueError, AttributeError):
         raise ValidationError("Invalid date format. Use ISO 8601 format (YYYY-MM-DDTHH:MM:SS)")
 